@@ -4,6 +4,7 @@ GestureControlPC 安装脚本
 
 from setuptools import setup, find_packages
 from pathlib import Path
+import sys
 
 # 读取README
 readme_path = Path(__file__).parent / "README.md"
@@ -21,6 +22,25 @@ if requirements_path.exists():
         if line.strip() and not line.startswith('#')
     ]
 
+# 可选：Cython 编译粒子更新内核，未安装 Cython 时使用 NumPy 实现
+ext_modules = []
+try:
+    from Cython.Build import cythonize
+    from setuptools import Extension
+
+    ext_modules = cythonize(
+        [
+            Extension(
+                "domain._particle_kernel",
+                ["src/domain/_particle_kernel.pyx"],
+                extra_compile_args=["/O2"] if sys.platform == "win32" else ["-O3", "-march=native"],
+            )
+        ],
+        compiler_directives={"language_level": "3"},
+    )
+except ImportError:
+    pass
+
 setup(
     name="GestureControlPC",
     version="1.0.0",
@@ -45,6 +65,7 @@ setup(
     ],
     python_requires=">=3.9",
     install_requires=requirements,
+    ext_modules=ext_modules,
     entry_points={
         "console_scripts": [
             "gesture-control=main:main",
@@ -5,12 +5,47 @@ Config Manager - 配置管理器
 
 import json
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Tuple
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 可选：orjson 解析/序列化比标准库 json 快数倍，未安装时回退
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _loads(text: str) -> Any:
+    """解析JSON文本"""
+    if HAS_ORJSON:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _dumps(data: Any) -> str:
+    """序列化为缩进2格、保留非ASCII字符的JSON文本，两种后端输出格式一致"""
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+# 进程内已解析配置文件缓存：{路径: ((mtime_ns, 文件大小), 解析结果)}
+# 缓存内容只读，取出时复制一份交给调用方
+_PARSE_CACHE: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+
+def _copy_json(obj: Any) -> Any:
+    """复制 JSON 原生数据（dict/list/标量），比 copy.deepcopy 少了 memo 开销"""
+    t = type(obj)
+    if t is dict:
+        return {k: _copy_json(v) for k, v in obj.items()}
+    if t is list:
+        return [_copy_json(v) for v in obj]
+    return obj
+
 
 class ConfigManager:
     """配置管理器 - 统一管理所有配置"""
@@ -20,11 +55,13 @@ class ConfigManager:
     def __init__(self, config_dir: Optional[str] = None):
         self.config_dir = Path(config_dir) if config_dir else Path(self.DEFAULT_CONFIG_DIR)
         
-        # 配置缓存
-        self._settings: Dict[str, Any] = {}
-        self._gestures: Dict[str, Any] = {}
-        self._effects: Dict[str, Any] = {}
-        self._calibration: Dict[str, Any] = {}
+        # 配置缓存：None 表示尚未加载，首次访问对应属性时才读取文件
+        self._settings: Optional[Dict[str, Any]] = None
+        self._gestures: Optional[Dict[str, Any]] = None
+        self._effects: Optional[Dict[str, Any]] = None
+        self._calibration: Optional[Dict[str, Any]] = None
+        # 手势名 → gesture_mappings 下标，随 gestures 加载时构建
+        self._gesture_index: Dict[str, int] = {}
         
         # 确保配置目录存在
         self.config_dir.mkdir(parents=True, exist_ok=True)
@@ -32,32 +69,38 @@ class ConfigManager:
         logger.info(f"配置管理器初始化，配置目录: {self.config_dir}")
     
     def load_all(self):
-        """加载所有配置文件"""
-        self._settings = self._load_json("settings.json", self._default_settings())
-        self._gestures = self._load_json("gestures.json", self._default_gestures())
-        self._effects = self._load_json("effects.json", self._default_effects())
-        self._calibration = self._load_json("calibration.json", self._default_calibration())
+        """
+        (重新)加载配置：清空缓存并立即读取常用的 settings，
+        其余文件在首次访问对应属性时再读取
+        """
+        self._settings = None
+        self._gestures = None
+        self._effects = None
+        self._calibration = None
+        self.settings
         
-        logger.info("所有配置已加载")
+        logger.info("配置已加载")
     
     def save_all(self):
-        """保存所有配置"""
-        self._save_json("settings.json", self._settings)
-        self._save_json("gestures.json", self._gestures)
-        self._save_json("effects.json", self._effects)
-        self._save_json("calibration.json", self._calibration)
+        """保存所有已加载的配置（未加载的文件内容未变，无需重写）"""
+        for filename, data in (("settings.json", self._settings),
+                               ("gestures.json", self._gestures),
+                               ("effects.json", self._effects),
+                               ("calibration.json", self._calibration)):
+            if data is not None:
+                self._save_json(filename, data)
         
         logger.info("所有配置已保存")
     
-    def _load_json(self, filename: str, default: dict) -> dict:
-        """加载JSON配置文件"""
+    def _load_json(self, filename: str, default: dict,
+                   merge: Optional[Callable[[dict, dict], dict]] = None) -> dict:
+        """加载JSON配置文件，merge 为默认值与文件内容的合并方式（默认深度合并）"""
         filepath = self.config_dir / filename
         try:
             if filepath.exists():
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # 合并默认值（确保新增的配置项有值）
-                    return self._deep_merge(default, data)
+                data = self._read_json_cached(filepath)
+                # 合并默认值（确保新增的配置项有值）
+                return (merge or self._deep_merge)(default, data)
             else:
                 # 创建默认配置
                 self._save_json(filename, default)
@@ -66,93 +109,172 @@ class ConfigManager:
             logger.error(f"加载配置失败 {filename}: {e}")
             return default
     
+    def _read_json_cached(self, filepath: Path) -> Any:
+        """读取并解析JSON文件；文件修改时间与大小未变时复用上次的解析结果"""
+        key = str(filepath)
+        st = filepath.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        hit = _PARSE_CACHE.get(key)
+        if hit is not None and hit[0] == stamp:
+            return _copy_json(hit[1])
+        
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = _loads(f.read())
+        _PARSE_CACHE[key] = (stamp, data)
+        return _copy_json(data)
+    
     def _save_json(self, filename: str, data: dict):
         """保存JSON配置文件"""
         filepath = self.config_dir / filename
+        # 文件系统时间戳精度较粗时修改时间可能不变，写入前先使缓存失效
+        _PARSE_CACHE.pop(str(filepath), None)
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+                f.write(_dumps(data))
         except Exception as e:
             logger.error(f"保存配置失败 {filename}: {e}")
     
     def _deep_merge(self, default: dict, override: dict) -> dict:
-        """深度合并字典"""
-        result = default.copy()
+        """
+        深度合并字典
+        override 为空时直接返回 default（不复制），调用方传入的默认值均为新建对象
+        """
+        if not override:
+            return default
+        result = dict(default)
         for key, value in override.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._deep_merge(result[key], value)
+            # 精确类型比较，比 isinstance 更快；配置只含 JSON 原生 dict
+            current = result.get(key)
+            if type(current) is dict and type(value) is dict:
+                result[key] = self._deep_merge(current, value)
             else:
                 result[key] = value
         return result
     
-    # 属性访问器
+    @staticmethod
+    def _merge_sections(default: dict, override: dict) -> dict:
+        """
+        按分区浅合并：顶层键覆盖，两边都是 dict 的分区再合并一层
+        对两层深的配置与 _deep_merge 结果相同，但只为每个分区分配一次；
+        分区内的叶子合并用 |=（PEP 584），由 CPython 的 dict_merge 在 C 层完成
+        """
+        if not override:
+            return default
+        result = dict(default)
+        result |= override
+        for key, value in override.items():
+            current = default.get(key)
+            if type(current) is dict and type(value) is dict:
+                section = dict(current)
+                section |= value
+                result[key] = section
+        return result
+    
+    # 属性访问器（按需加载）
+    # settings/gestures/calibration 的默认值只有 "分区 → 叶子" 两层，按分区浅合并即可；
+    # effects 含 "effects → 特效名 → 参数" 三层，仍需深度合并
     @property
     def settings(self) -> dict:
+        if self._settings is None:
+            self._settings = self._load_json("settings.json", self._default_settings(), self._merge_sections)
         return self._settings
     
     @property
     def gestures(self) -> dict:
+        if self._gestures is None:
+            self._gestures = self._load_json("gestures.json", self._default_gestures(), self._merge_sections)
+            self._rebuild_gesture_index()
         return self._gestures
     
     @property
     def effects(self) -> dict:
+        if self._effects is None:
+            self._effects = self._load_json("effects.json", self._default_effects())
         return self._effects
     
     @property
     def calibration(self) -> dict:
+        if self._calibration is None:
+            self._calibration = self._load_json("calibration.json", self._default_calibration(), self._merge_sections)
         return self._calibration
     
     # 便捷访问方法
     def get_camera_config(self) -> dict:
         """获取摄像头配置"""
-        return self._settings.get('camera', {})
+        return self.settings.get('camera', {})
     
     def get_display_config(self) -> dict:
         """获取显示配置"""
-        return self._settings.get('display', {})
+        return self.settings.get('display', {})
     
     def get_recognition_config(self) -> dict:
         """获取识别配置"""
-        return self._settings.get('recognition', {})
+        return self.settings.get('recognition', {})
     
     def get_safe_zone_config(self) -> dict:
         """获取安全区域配置"""
-        return self._settings.get('safe_zone', {})
+        return self.settings.get('safe_zone', {})
     
     def get_gesture_mappings(self) -> list:
         """获取手势映射列表"""
-        return self._gestures.get('gesture_mappings', [])
+        return self.gestures.get('gesture_mappings', [])
+    
+    def get_gesture_mapping(self, gesture: str) -> Optional[dict]:
+        """按手势名获取单条映射，不存在时返回 None"""
+        i = self._find_gesture_mapping(gesture)
+        return None if i is None else self.gestures['gesture_mappings'][i]
+    
+    def _rebuild_gesture_index(self):
+        """重建手势名 → 映射下标的索引（同名映射以首条为准，与线性查找一致）"""
+        self._gesture_index = {}
+        for i, m in enumerate(self._gestures.get('gesture_mappings', [])):
+            self._gesture_index.setdefault(m.get('gesture'), i)
+    
+    def _find_gesture_mapping(self, gesture: str) -> Optional[int]:
+        """
+        通过索引 O(1) 查找映射下标
+        get_gesture_mappings 返回的是原列表，可能被外部直接修改：命中时校验下标处的手势名，
+        未命中时无法确认索引是否过期，一律重建后再查
+        """
+        mappings = self.gestures.get('gesture_mappings', [])
+        i = self._gesture_index.get(gesture)
+        if i is None or i >= len(mappings) or mappings[i].get('gesture') != gesture:
+            self._rebuild_gesture_index()
+            i = self._gesture_index.get(gesture)
+        return i
     
     def get_effect_config(self, effect_name: str) -> dict:
         """获取特效配置"""
-        effects = self._effects.get('effects', {})
+        effects = self.effects.get('effects', {})
         return effects.get(effect_name, {})
     
     def get_all_effect_configs(self) -> dict:
         """获取所有特效配置"""
-        return self._effects.get('effects', {})
+        return self.effects.get('effects', {})
     
     # 更新方法
     def update_setting(self, key: str, value: Any):
         """更新设置"""
         keys = key.split('.')
-        target = self._settings
+        target = self.settings
         for k in keys[:-1]:
             target = target.setdefault(k, {})
         target[keys[-1]] = value
     
     def update_gesture_mapping(self, gesture: str, mapping: dict):
         """更新手势映射"""
-        mappings = self._gestures.get('gesture_mappings', [])
-        for i, m in enumerate(mappings):
-            if m.get('gesture') == gesture:
-                mappings[i] = mapping
-                return
-        mappings.append(mapping)
+        i = self._find_gesture_mapping(gesture)
+        if i is not None:
+            self.gestures['gesture_mappings'][i] = mapping
+            if mapping.get('gesture') != gesture:
+                self._rebuild_gesture_index()
+            return
+        self.gestures.setdefault('gesture_mappings', []).append(mapping)
+        self._rebuild_gesture_index()
     
     def update_calibration(self, calibration: dict):
         """更新校准数据"""
-        self._calibration.update(calibration)
+        self.calibration.update(calibration)
     
     # 默认配置
     def _default_settings(self) -> dict:
@@ -184,7 +306,9 @@ class ConfigManager:
                 "min_tracking_confidence": 0.5,
                 "max_num_hands": 2,
                 "static_gesture_hold_time_ms": 150,
-                "gesture_cooldown_ms": 700
+                "gesture_cooldown_ms": 700,
+                "inference_max_width": 640,
+                "infer_every_n_frames": 2
             },
             "safe_zone": {
                 "enabled": True,
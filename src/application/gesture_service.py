@@ -28,7 +28,9 @@ class GestureService:
         self.mediapipe = MediaPipeAdapter(
             max_num_hands=recognition_config.get('max_num_hands', 2),
             min_detection_confidence=recognition_config.get('min_detection_confidence', 0.7),
-            min_tracking_confidence=recognition_config.get('min_tracking_confidence', 0.5)
+            min_tracking_confidence=recognition_config.get('min_tracking_confidence', 0.5),
+            inference_max_width=recognition_config.get('inference_max_width', 640),
+            infer_every=recognition_config.get('infer_every_n_frames', 2)
         )
         
         # 状态机配置
@@ -0,0 +1,59 @@
+# cython: language_level=3
+"""
+Particle Kernel - 粒子更新内核（Cython 编译版）
+与 effect._update_soa 的 NumPy 实现语义一致，未编译时自动回退
+"""
+
+cimport cython
+from libc.math cimport sinf
+
+
+def update_soa(float[::1] x, float[::1] y,
+               float[::1] vx, float[::1] vy,
+               float[::1] ax, float[::1] ay,
+               float[::1] rotation, float[::1] rotation_speed,
+               float[::1] age, float[::1] lifetime, float[::1] alpha,
+               unsigned char[::1] twinkle, float[::1] twinkle_speed,
+               unsigned char[::1] alive, float dt):
+    """单次融合循环更新所有存活粒子；循环期间释放 GIL，界面线程可并行绘制"""
+    with nogil:
+        _update(x, y, vx, vy, ax, ay, rotation, rotation_speed,
+                age, lifetime, alpha, twinkle, twinkle_speed, alive, dt)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _update(float[::1] x, float[::1] y,
+                  float[::1] vx, float[::1] vy,
+                  float[::1] ax, float[::1] ay,
+                  float[::1] rotation, float[::1] rotation_speed,
+                  float[::1] age, float[::1] lifetime, float[::1] alpha,
+                  unsigned char[::1] twinkle, float[::1] twinkle_speed,
+                  unsigned char[::1] alive, float dt) noexcept nogil:
+    cdef Py_ssize_t i, n = x.shape[0]
+    cdef float a
+
+    for i in range(n):
+        if not alive[i]:
+            continue
+
+        # 更新位置
+        vx[i] += ax[i] * dt
+        vy[i] += ay[i] * dt
+        x[i] += vx[i] * dt
+        y[i] += vy[i] * dt
+
+        # 更新旋转与年龄
+        rotation[i] += rotation_speed[i] * dt
+        age[i] += dt
+
+        # 检查生命周期
+        if age[i] >= lifetime[i]:
+            alive[i] = 0
+            continue
+
+        # 随时间淡出 + 闪烁
+        a = 1.0 - age[i] / lifetime[i]
+        if twinkle[i]:
+            a *= 0.7 + 0.3 * sinf(age[i] * twinkle_speed[i] * 20.0)
+        alpha[i] = a
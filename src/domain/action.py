@@ -5,9 +5,11 @@ Action Domain Model - 动作领域模型
 
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
 import time
 
+import numpy as np
+
 
 class ActionType(Enum):
     """动作类型枚举"""
@@ -124,37 +126,63 @@ class ActionMapping:
     """手势-动作映射管理"""
     
     def __init__(self):
-        self._mappings: Dict[str, Action] = {}
-        self._cooldown_tracker: Dict[str, float] = {}
+        # 手势名在注册时映射为小整数ID，内部的动作表和冷却时间戳（毫秒，0 表示从未触发）均按ID索引
+        self._name_to_id: Dict[str, int] = {}
+        self._mappings: List[Optional[Action]] = []
+        self._cooldown_tracker = np.zeros(0, dtype=np.int64)
     
     def register(self, gesture_name: str, action: Action):
         """注册手势-动作映射"""
-        self._mappings[gesture_name] = action
+        self._mappings[self._intern(gesture_name)] = action
+    
+    def _intern(self, gesture_name: str) -> int:
+        """获取手势名对应的整数ID，必要时分配并扩容内部表"""
+        gesture_id = self._name_to_id.get(gesture_name)
+        if gesture_id is None:
+            gesture_id = len(self._name_to_id)
+            self._name_to_id[gesture_name] = gesture_id
+            self._mappings.append(None)
+            if gesture_id >= len(self._cooldown_tracker):
+                grown = np.zeros(max(8, 2 * len(self._cooldown_tracker)), dtype=np.int64)
+                grown[:len(self._cooldown_tracker)] = self._cooldown_tracker
+                self._cooldown_tracker = grown
+        return gesture_id
     
     def get_action(self, gesture_name: str) -> Optional[Action]:
         """获取手势对应的动作"""
-        return self._mappings.get(gesture_name)
+        gesture_id = self._name_to_id.get(gesture_name)
+        if gesture_id is None:
+            return None
+        return self._mappings[gesture_id]
     
     def is_in_cooldown(self, gesture_name: str) -> bool:
         """检查动作是否在冷却期"""
-        if gesture_name not in self._cooldown_tracker:
+        gesture_id = self._name_to_id.get(gesture_name)
+        if gesture_id is None:
+            return False
+        
+        last_trigger = self._cooldown_tracker[gesture_id]
+        if last_trigger == 0:
             return False
         
-        action = self._mappings.get(gesture_name)
+        action = self._mappings[gesture_id]
         if not action:
             return False
         
         current_time = time.time() * 1000
-        last_trigger = self._cooldown_tracker[gesture_name]
         return (current_time - last_trigger) < action.cooldown_ms
     
     def mark_triggered(self, gesture_name: str):
         """标记动作已触发"""
-        self._cooldown_tracker[gesture_name] = time.time() * 1000
+        self._cooldown_tracker[self._intern(gesture_name)] = int(time.time() * 1000)
     
     def get_all_mappings(self) -> Dict[str, Action]:
         """获取所有映射"""
-        return self._mappings.copy()
+        return {
+            name: self._mappings[gesture_id]
+            for name, gesture_id in self._name_to_id.items()
+            if self._mappings[gesture_id] is not None
+        }
     
     def load_from_config(self, config: list):
         """从配置加载映射"""
@@ -4,12 +4,15 @@ Effect Domain Model - 特效领域模型
 """
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from enum import Enum, auto
-from typing import Tuple, List, Optional
+from typing import Tuple, List, Optional, Iterator, Dict
 import math
 import random
 import time
 
+import numpy as np
+
 
 class EffectType(Enum):
     """特效类型"""
@@ -21,29 +24,51 @@ class EffectType(Enum):
     GLOW = auto()            # 发光
 
 
+def pack_rgb(r: int, g: int, b: int) -> int:
+    """将RGB打包为 0x00RRGGBB 整数"""
+    return (int(r) << 16) | (int(g) << 8) | int(b)
+
+
+def unpack_rgb(c: int) -> Tuple[int, int, int]:
+    """将 0x00RRGGBB 整数解包为RGB元组"""
+    return ((c >> 16) & 0xFF, (c >> 8) & 0xFF, c & 0xFF)
+
+
 @dataclass
 class Particle:
     """粒子实体"""
+    # 热字段：每帧更新循环都会读写，集中放在前面
     x: float                 # x坐标
     y: float                 # y坐标
     vx: float = 0            # x速度
     vy: float = 0            # y速度
     ax: float = 0            # x加速度
     ay: float = 0            # y加速度
-    size: float = 5          # 大小
-    color: Tuple[int, int, int] = (255, 255, 255)  # RGB颜色
+    age: float = 0           # 当前年龄
+    lifetime: float = 1.0    # 生命周期（秒）
     alpha: float = 1.0       # 透明度 (0-1)
+    is_alive: bool = True
+    
+    # 渲染属性
+    size: float = 5          # 大小
+    color_u32: int = 0xFFFFFF  # 打包的RGB颜色 (0x00RRGGBB)
     rotation: float = 0      # 旋转角度
     rotation_speed: float = 0
-    lifetime: float = 1.0    # 生命周期（秒）
-    age: float = 0           # 当前年龄
-    is_alive: bool = True
     
     # 额外属性
     glow: bool = False
     twinkle: bool = False
     twinkle_speed: float = 0.1
     
+    @property
+    def color(self) -> Tuple[int, int, int]:
+        """RGB颜色"""
+        return unpack_rgb(self.color_u32)
+    
+    @color.setter
+    def color(self, value: Tuple[int, int, int]):
+        self.color_u32 = pack_rgb(*value)
+    
     def update(self, dt: float):
         """更新粒子状态"""
         if not self.is_alive:
@@ -87,6 +112,60 @@ class Particle:
         self.is_alive = True
 
 
+def _update_soa(x: np.ndarray, y: np.ndarray,
+                vx: np.ndarray, vy: np.ndarray,
+                ax: np.ndarray, ay: np.ndarray,
+                rotation: np.ndarray, rotation_speed: np.ndarray,
+                age: np.ndarray, lifetime: np.ndarray, alpha: np.ndarray,
+                twinkle: np.ndarray, twinkle_speed: np.ndarray,
+                alive: np.ndarray, dt: float):
+    """
+    原地更新结构数组形式的粒子（NumPy 实现，与 Particle.update 语义一致）
+    
+    所有数组为等长一维 float32 数组，twinkle/alive 为 uint8
+    """
+    idx = np.flatnonzero(alive)
+    if idx.size == 0:
+        return
+    
+    # 更新位置
+    vx[idx] += ax[idx] * dt
+    vy[idx] += ay[idx] * dt
+    x[idx] += vx[idx] * dt
+    y[idx] += vy[idx] * dt
+    
+    # 更新旋转与年龄
+    rotation[idx] += rotation_speed[idx] * dt
+    age[idx] += dt
+    
+    # 检查生命周期
+    a = age[idx]
+    dead = a >= lifetime[idx]
+    alive[idx[dead]] = 0
+    
+    # 随时间淡出 + 闪烁
+    live = idx[~dead]
+    a = age[live]
+    fade = 1 - a / lifetime[live]
+    tw = twinkle[live].astype(bool)
+    fade[tw] *= 0.7 + 0.3 * np.sin(a[tw] * twinkle_speed[live][tw] * 20)
+    alpha[live] = fade
+
+
+# 内核选择：Cython 编译版 > Numba JIT > NumPy 实现
+from .effect_kernels import HAVE_NUMBA
+
+try:
+    from ._particle_kernel import update_soa
+    HAVE_PARTICLE_KERNEL = True
+except ImportError:
+    HAVE_PARTICLE_KERNEL = False
+    if HAVE_NUMBA:
+        from .effect_kernels import step as update_soa
+    else:
+        update_soa = _update_soa
+
+
 @dataclass
 class EffectConfig:
     """特效配置"""
@@ -106,6 +185,12 @@ class EffectConfig:
     fade_duration_ms: int = 500
     twinkle_enabled: bool = True
     twinkle_speed: float = 0.1
+    colors_u32: List[int] = field(init=False, repr=False)  # 打包后的颜色，供粒子直接使用
+    colors_arr: np.ndarray = field(init=False, repr=False, compare=False)  # 打包颜色查找表 (uint32)，批量生成时按下标选取
+    
+    def __post_init__(self):
+        self.colors_u32 = [pack_rgb(*c) for c in self.colors]
+        self.colors_arr = np.array(self.colors_u32, dtype=np.uint32)
     
     @classmethod
     def from_config(cls, effect_type: EffectType, config: dict) -> 'EffectConfig':
@@ -163,20 +248,73 @@ class HeartCurve:
         return (x, y)
     
     @staticmethod
-    def get_points(num_points: int, scale: float = 1.0, center: Tuple[float, float] = (0, 0)) -> List[Tuple[float, float]]:
-        """获取心形曲线上的多个点"""
-        points = []
-        for i in range(num_points):
-            t = 2 * math.pi * i / num_points
-            points.append(HeartCurve.get_point(t, scale, center))
+    def batch(t: np.ndarray, scale=1.0, center: Tuple[float, float] = (0, 0)) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        向量化版本的 get_point，一次计算多个参数值对应的点
+        
+        Args:
+            t: 参数值数组
+            scale: 缩放比例，可以是标量或与 t 等长的数组
+            center: 中心点坐标
+        
+        Returns:
+            (x, y) 两个与 t 等长的数组
+        """
+        t = np.asarray(t)
+        sin_t = np.sin(t)
+        cos_t = np.cos(t)
+        x = sin_t * sin_t * sin_t
+        y = (13 * cos_t - 5 * np.cos(2 * t) - 2 * np.cos(3 * t) - np.cos(4 * t)) / 16
+        return center[0] + x * scale, center[1] - y * scale
+    
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def unit_points(num_points: int, turns: float = 1.0) -> np.ndarray:
+        """
+        scale=1、中心在原点的心形曲线采样点，按参数缓存
+        
+        Returns:
+            (num_points, 2) 的 float64 只读数组，第 i 个点对应 t = 2π·turns·i/num_points
+        """
+        t = np.arange(num_points) * (2 * math.pi * turns / max(num_points, 1))
+        points = np.empty((num_points, 2), dtype=np.float64)
+        points[:, 0], points[:, 1] = HeartCurve.batch(t)
+        points.flags.writeable = False
         return points
     
+    @staticmethod
+    def get_points_array(num_points: int, scale: float = 1.0, center: Tuple[float, float] = (0, 0)) -> np.ndarray:
+        """
+        获取心形曲线上均匀分布的多个点
+        
+        Returns:
+            (num_points, 2) 的 float32 连续数组，第 i 个点对应 t = 2π·i/num_points
+        """
+        # 单位曲线按点数缓存，每次只需一次缩放和平移
+        points = HeartCurve.unit_points(num_points) * scale
+        points += center
+        return points.astype(np.float32)
+    
+    @staticmethod
+    def get_points(num_points: int, scale: float = 1.0, center: Tuple[float, float] = (0, 0)) -> List[Tuple[float, float]]:
+        """获取心形曲线上的多个点（兼容接口，新代码请使用 get_points_array）"""
+        return [tuple(p) for p in HeartCurve.get_points_array(num_points, scale, center).tolist()]
+    
     @staticmethod
     def get_random_point_on_heart(scale: float = 1.0, center: Tuple[float, float] = (0, 0)) -> Tuple[float, float]:
         """获取心形曲线上的随机点"""
         t = random.uniform(0, 2 * math.pi)
         return HeartCurve.get_point(t, scale, center)
     
+    @staticmethod
+    def get_random_points_on_heart(num_points: int, scale: float = 1.0,
+                                   center: Tuple[float, float] = (0, 0)) -> np.ndarray:
+        """批量获取心形曲线上的随机点，返回 (num_points, 2) 的 float32 数组"""
+        t = np.random.uniform(0, 2 * math.pi, num_points)
+        points = np.empty((num_points, 2), dtype=np.float32)
+        points[:, 0], points[:, 1] = HeartCurve.batch(t, scale, center)
+        return points
+    
     @staticmethod
     def get_random_point_inside_heart(scale: float = 1.0, center: Tuple[float, float] = (0, 0)) -> Tuple[float, float]:
         """获取心形内部的随机点"""
@@ -197,62 +335,243 @@ class HeartCurve:
                 return (x + center[0], y + center[1])
 
 
+class ParticleSoA:
+    """
+    粒子结构数组（SoA）存储
+    每个属性一列连续数组，槽位下标即粒子ID；alive 同时作为活跃掩码
+    """
+    
+    # 浮点列及其默认值
+    FLOAT_FIELDS = {
+        'x': 0.0, 'y': 0.0,
+        'vx': 0.0, 'vy': 0.0,
+        'ax': 0.0, 'ay': 0.0,
+        'age': 0.0, 'lifetime': 1.0, 'alpha': 1.0,
+        'size': 5.0, 'rotation': 0.0, 'rotation_speed': 0.0,
+        'twinkle_speed': 0.1,
+    }
+    # 标志列（uint8）
+    FLAG_FIELDS = ('alive', 'glow', 'twinkle')
+    
+    def __init__(self, capacity: int):
+        self.capacity = 0
+        for name in self.FLOAT_FIELDS:
+            setattr(self, name, np.empty(0, dtype=np.float32))
+        self.color = np.empty(0, dtype=np.uint32)
+        for name in self.FLAG_FIELDS:
+            setattr(self, name, np.empty(0, dtype=np.uint8))
+        self.grow(capacity)
+    
+    def grow(self, capacity: int):
+        """扩容到指定容量，保留已有数据"""
+        if capacity <= self.capacity:
+            return
+        old = self.capacity
+        for name, default in self.FLOAT_FIELDS.items():
+            column = np.full(capacity, default, dtype=np.float32)
+            column[:old] = getattr(self, name)
+            setattr(self, name, column)
+        color = np.full(capacity, 0xFFFFFF, dtype=np.uint32)
+        color[:old] = self.color
+        self.color = color
+        for name in self.FLAG_FIELDS:
+            column = np.zeros(capacity, dtype=np.uint8)
+            column[:old] = getattr(self, name)
+            setattr(self, name, column)
+        self.capacity = capacity
+    
+    def reset(self, slots, x, y):
+        """将槽位重置为默认状态并放置到 (x, y)，slots 可以是单个下标或下标数组"""
+        for name, default in self.FLOAT_FIELDS.items():
+            getattr(self, name)[slots] = default
+        self.x[slots] = x
+        self.y[slots] = y
+        self.color[slots] = 0xFFFFFF
+        self.glow[slots] = 0
+        self.twinkle[slots] = 0
+        self.alive[slots] = 1
+    
+    def update(self, dt: float):
+        """原地推进所有存活粒子"""
+        update_soa(self.x, self.y, self.vx, self.vy, self.ax, self.ay,
+                   self.rotation, self.rotation_speed,
+                   self.age, self.lifetime, self.alpha,
+                   self.twinkle, self.twinkle_speed, self.alive, dt)
+
+
+def _soa_property(name: str, cast=float) -> property:
+    """生成读写 SoA 列中单个槽位的属性"""
+    def fget(self):
+        return cast(getattr(self._soa, name)[self._slot])
+    
+    def fset(self, value):
+        getattr(self._soa, name)[self._slot] = value
+    
+    return property(fget, fset)
+
+
+class ParticleView:
+    """粒子视图 - 以 Particle 风格的属性读写 SoA 中的一个槽位"""
+    
+    __slots__ = ('_soa', '_slot')
+    
+    def __init__(self, soa: ParticleSoA, slot: int):
+        self._soa = soa
+        self._slot = slot
+    
+    @property
+    def slot(self) -> int:
+        """槽位下标"""
+        return self._slot
+    
+    x = _soa_property('x')
+    y = _soa_property('y')
+    vx = _soa_property('vx')
+    vy = _soa_property('vy')
+    ax = _soa_property('ax')
+    ay = _soa_property('ay')
+    age = _soa_property('age')
+    lifetime = _soa_property('lifetime')
+    alpha = _soa_property('alpha')
+    is_alive = _soa_property('alive', bool)
+    size = _soa_property('size')
+    color_u32 = _soa_property('color', int)
+    rotation = _soa_property('rotation')
+    rotation_speed = _soa_property('rotation_speed')
+    glow = _soa_property('glow', bool)
+    twinkle = _soa_property('twinkle', bool)
+    twinkle_speed = _soa_property('twinkle_speed')
+    
+    @property
+    def color(self) -> Tuple[int, int, int]:
+        """RGB颜色"""
+        return unpack_rgb(self.color_u32)
+    
+    @color.setter
+    def color(self, value: Tuple[int, int, int]):
+        self.color_u32 = pack_rgb(*value)
+
+
 class ParticlePool:
-    """粒子对象池 - 避免频繁创建/销毁"""
+    """粒子对象池 - 基于 SoA 槽位，避免频繁创建/销毁"""
     
     def __init__(self, initial_size: int = 200):
-        self._pool: List[Particle] = []
-        self._active: List[Particle] = []
+        self.soa = ParticleSoA(initial_size)
+        # 空闲槽位栈：_free[:_free_top] 为可用槽位，倒序存放使先分配低下标
+        self._free = np.arange(initial_size - 1, -1, -1, dtype=np.int32)
+        self._free_top = initial_size
+    
+    def _grow(self, required: int):
+        """扩容直到空闲槽位不少于 required"""
+        old = self.soa.capacity
+        capacity = max(16, old * 2)
+        while capacity - old + self._free_top < required:
+            capacity *= 2
+        self.soa.grow(capacity)
         
-        # 预创建粒子
-        for _ in range(initial_size):
-            self._pool.append(Particle(0, 0))
+        # 新槽位放在栈底，已有的空闲槽位优先复用
+        added = capacity - old
+        free = np.empty(capacity, dtype=np.int32)
+        free[:added] = np.arange(capacity - 1, old - 1, -1, dtype=np.int32)
+        free[added:added + self._free_top] = self._free[:self._free_top]
+        self._free = free
+        self._free_top += added
     
-    def acquire(self, x: float = 0, y: float = 0) -> Particle:
-        """获取一个粒子"""
-        if self._pool:
-            particle = self._pool.pop()
-        else:
-            particle = Particle(0, 0)
+    def _push_free(self, slots: np.ndarray):
+        """将槽位压回空闲栈"""
+        n = len(slots)
+        self._free[self._free_top:self._free_top + n] = slots
+        self._free_top += n
+    
+    def acquire_slot(self, x: float = 0, y: float = 0) -> int:
+        """获取一个粒子槽位"""
+        if self._free_top == 0:
+            self._grow(1)
         
-        particle.reset(x, y)
-        self._active.append(particle)
-        return particle
+        self._free_top -= 1
+        slot = int(self._free[self._free_top])
+        self.soa.reset(slot, x, y)
+        return slot
     
-    def release(self, particle: Particle):
-        """释放粒子回池"""
-        if particle in self._active:
-            self._active.remove(particle)
-            particle.is_alive = False
-            self._pool.append(particle)
+    def acquire_batch(self, n: int, x: float = 0, y: float = 0) -> np.ndarray:
+        """批量获取 n 个粒子槽位，返回槽位下标数组"""
+        if self._free_top < n:
+            self._grow(n)
+        
+        self._free_top -= n
+        slots = self._free[self._free_top:self._free_top + n][::-1].astype(np.int64)
+        self.soa.reset(slots, x, y)
+        return slots
+    
+    def acquire(self, x: float = 0, y: float = 0) -> ParticleView:
+        """获取一个粒子"""
+        return ParticleView(self.soa, self.acquire_slot(x, y))
+    
+    def release(self, particle):
+        """释放粒子回池，particle 可以是 ParticleView 或槽位下标"""
+        slot = particle.slot if isinstance(particle, ParticleView) else int(particle)
+        if self.soa.alive[slot]:
+            self.soa.alive[slot] = 0
+            self._free[self._free_top] = slot
+            self._free_top += 1
     
     def update_all(self, dt: float):
-        """更新所有活跃粒子"""
-        dead_particles = []
-        for particle in self._active:
-            particle.update(dt)
-            if not particle.is_alive:
-                dead_particles.append(particle)
+        """更新所有活跃粒子并回收死亡粒子"""
+        before = self.active_slots()
+        if before.size == 0:
+            return
+        
+        self.soa.update(dt)
         
         # 回收死亡粒子
-        for particle in dead_particles:
-            self.release(particle)
+        self._push_free(before[self.soa.alive[before] == 0])
+    
+    def active_slots(self) -> np.ndarray:
+        """获取所有活跃粒子的槽位下标"""
+        return np.flatnonzero(self.soa.alive)
+    
+    def iter_active(self) -> Iterator[ParticleView]:
+        """遍历活跃粒子"""
+        for slot in self.active_slots().tolist():
+            yield ParticleView(self.soa, slot)
     
-    def get_active_particles(self) -> List[Particle]:
-        """获取所有活跃粒子"""
-        return self._active.copy()
+    def get_active_particles(self) -> List[ParticleView]:
+        """获取所有活跃粒子（已弃用，请使用 iter_active 或 snapshot_soa）"""
+        return list(self.iter_active())
+    
+    def snapshot_soa(self) -> Dict[str, np.ndarray]:
+        """
+        以结构数组（SoA）形式导出活跃粒子，供渲染器批量绘制
+        
+        Returns:
+            {'x', 'y', 'size', 'alpha'}: float32 数组
+            {'color_r', 'color_g', 'color_b'}: uint8 数组
+            所有数组长度均为 active_count，顺序一致
+        """
+        idx = self.active_slots()
+        color = self.soa.color[idx]
+        return {
+            'x': self.soa.x[idx],
+            'y': self.soa.y[idx],
+            'size': self.soa.size[idx],
+            'color_r': ((color >> 16) & 0xFF).astype(np.uint8),
+            'color_g': ((color >> 8) & 0xFF).astype(np.uint8),
+            'color_b': (color & 0xFF).astype(np.uint8),
+            'alpha': self.soa.alpha[idx],
+        }
     
     def clear_active(self):
         """清除所有活跃粒子"""
-        for particle in self._active[:]:
-            self.release(particle)
+        slots = self.active_slots()
+        self.soa.alive[slots] = 0
+        self._push_free(slots)
     
     @property
     def active_count(self) -> int:
         """活跃粒子数量"""
-        return len(self._active)
+        return self.soa.capacity - self._free_top
     
     @property
     def pool_size(self) -> int:
         """池中可用粒子数量"""
-        return len(self._pool)
+        return self._free_top
@@ -0,0 +1,78 @@
+"""
+Effect Kernels - 粒子计算内核
+使用 Numba JIT 将逐帧粒子积分融合为单次遍历，Numba 未安装时不可用；
+坐标换算内核在 Numba 缺失时回退为 NumPy 实现
+"""
+
+import math
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+
+if HAVE_NUMBA:
+    @njit(parallel=True, nogil=True, fastmath=True)
+    def step(x, y, vx, vy, ax, ay, rotation, rotation_speed,
+             age, lifetime, alpha, twinkle, twinkle_speed, alive, dt):
+        """原地更新所有存活粒子，参数与 effect.update_soa 一致；执行期间释放 GIL"""
+        for i in prange(x.shape[0]):
+            if not alive[i]:
+                continue
+
+            # 更新位置
+            vx[i] += ax[i] * dt
+            vy[i] += ay[i] * dt
+            x[i] += vx[i] * dt
+            y[i] += vy[i] * dt
+
+            # 更新旋转与年龄
+            rotation[i] += rotation_speed[i] * dt
+            age[i] += dt
+
+            # 检查生命周期
+            if age[i] >= lifetime[i]:
+                alive[i] = 0
+                continue
+
+            # 随时间淡出 + 闪烁
+            a = 1.0 - age[i] / lifetime[i]
+            if twinkle[i]:
+                a *= 0.7 + 0.3 * math.sin(age[i] * twinkle_speed[i] * 20.0)
+            alpha[i] = a
+
+
+if HAVE_NUMBA:
+    @njit(nogil=True, fastmath=True)
+    def to_pixels(points, w, h):
+        """(N, >=2) 归一化坐标 -> (N, 2) int32 像素坐标"""
+        n = points.shape[0]
+        out = np.empty((n, 2), dtype=np.int32)
+        for i in range(n):
+            out[i, 0] = np.int32(points[i, 0] * w)
+            out[i, 1] = np.int32(points[i, 1] * h)
+        return out
+else:
+    def to_pixels(points, w, h):
+        """(N, >=2) 归一化坐标 -> (N, 2) int32 像素坐标"""
+        return (points[:, :2] * np.array([w, h], dtype=np.float32)).astype(np.int32)
+
+
+def warmup():
+    """用空数组调用一次内核，把 JIT 编译开销提前到启动阶段"""
+    if not HAVE_NUMBA:
+        return
+    f = np.zeros(0, dtype=np.float32)
+    u = np.zeros(0, dtype=np.uint8)
+    try:
+        step(f, f, f, f, f, f, f, f, f, f, f, u, f, u, 0.0)
+        to_pixels(np.zeros((0, 3), dtype=np.float32), 1, 1)
+    except Exception as e:
+        logger.warning(f"Numba 内核预热失败: {e}")
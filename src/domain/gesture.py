@@ -5,9 +5,11 @@ Gesture Domain Model - 手势领域模型
 
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Optional, Tuple, List
+from typing import Callable, Optional, Tuple, List
 import time
 
+import numpy as np
+
 
 class GestureType(Enum):
     """手势类型枚举"""
@@ -36,6 +38,15 @@ class GestureType(Enum):
     DOUBLE_TAP = auto()      # 双击
 
 
+# 指尖与PIP关节索引（食指、中指、无名指、小指）
+_FINGER_TIP_IDS = [8, 12, 16, 20]
+_FINGER_PIP_IDS = [6, 10, 14, 18]
+# 五指指尖索引（拇指、食指、中指、无名指、小指）
+_FINGERTIP_IDS = [4, 8, 12, 16, 20]
+# 手指位掩码权重：拇指为最高位，小指为最低位
+_FINGER_BITS = np.array([16, 8, 4, 2, 1], dtype=np.int64)
+
+
 class GestureState(Enum):
     """手势状态机状态"""
     IDLE = auto()            # 空闲状态
@@ -45,6 +56,11 @@ class GestureState(Enum):
     COOLDOWN = auto()        # 冷却中
 
 
+# 枚举名称表：Enum.name 是描述符属性，查表比逐次访问更快
+_GESTURE_TYPE_NAMES = {m: m.name for m in GestureType}
+_GESTURE_STATE_NAMES = {m: m.name for m in GestureState}
+
+
 @dataclass
 class HandLandmarks:
     """手部21个关键点数据"""
@@ -71,71 +87,85 @@ class HandLandmarks:
     PINKY_DIP = 19
     PINKY_TIP = 20
     
-    landmarks: List[Tuple[float, float, float]] = field(default_factory=list)
+    landmarks: np.ndarray = field(default_factory=lambda: np.empty((0, 3)))  # (21, 3) 数组
     handedness: str = "Right"  # "Left" or "Right"
     confidence: float = 0.0
+    image_size: Tuple[int, int] = (0, 0)  # 采集分辨率 (宽, 高)，由产生方填写；(0, 0) 表示未知
+    pixel_xy: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # (N, 2) int16 采集分辨率像素坐标
+    
+    def __post_init__(self):
+        # 兼容 list-of-tuples 输入，统一存储为 (N, 3) 连续数组；已是浮点数组（如 float32）时保留其精度
+        lm = self.landmarks
+        if not (isinstance(lm, np.ndarray) and np.issubdtype(lm.dtype, np.floating)):
+            lm = np.asarray(lm, dtype=np.float64)
+        self.landmarks = np.ascontiguousarray(lm).reshape(-1, 3)
+        
+        # 已知采集分辨率时一次换算为 int16 像素坐标，绘制端尺寸一致时直接使用
+        w, h = self.image_size
+        if self.pixel_xy is None and w > 0 and h > 0:
+            xy = self.landmarks[:, :2] * np.array([w, h], dtype=np.float32)
+            self.pixel_xy = np.clip(xy, -32768, 32767).astype(np.int16)
     
     def get_landmark(self, index: int) -> Optional[Tuple[float, float, float]]:
         """获取指定索引的关键点坐标 (x, y, z)"""
         if 0 <= index < len(self.landmarks):
-            return self.landmarks[index]
+            return tuple(self.landmarks[index].tolist())
         return None
     
     def get_fingertips(self) -> List[Tuple[float, float, float]]:
         """获取所有指尖坐标"""
-        tips = [4, 8, 12, 16, 20]  # 拇指、食指、中指、无名指、小指指尖
-        return [self.landmarks[i] for i in tips if i < len(self.landmarks)]
+        tips = [i for i in _FINGERTIP_IDS if i < len(self.landmarks)]
+        return [tuple(p) for p in self.landmarks[tips].tolist()]
+    
+    def distance_sq(self, a: int, b: int) -> float:
+        """两个关键点在图像平面上的距离平方，索引越界时返回 inf"""
+        n = len(self.landmarks)
+        if not (0 <= a < n and 0 <= b < n):
+            return float('inf')
+        d = self.landmarks[a, :2] - self.landmarks[b, :2]
+        return float(d @ d)
     
     def get_palm_center(self) -> Optional[Tuple[float, float, float]]:
         """计算手掌中心位置"""
         if len(self.landmarks) < 21:
             return None
         # 使用手腕和中指MCP的中点作为手掌中心
-        wrist = self.landmarks[0]
-        middle_mcp = self.landmarks[9]
-        return (
-            (wrist[0] + middle_mcp[0]) / 2,
-            (wrist[1] + middle_mcp[1]) / 2,
-            (wrist[2] + middle_mcp[2]) / 2
-        )
+        return tuple(((self.landmarks[0] + self.landmarks[9]) / 2).tolist())
+    
+    @property
+    def fingers_extended(self) -> np.ndarray:
+        """
+        五指伸展状态掩码 (5,) bool
+        顺序: 拇指, 食指, 中指, 无名指, 小指
+        """
+        lm = self.landmarks
+        extended = np.zeros(5, dtype=bool)
+        if len(lm) < 21:
+            return extended
+        
+        # 其他手指：指尖y坐标小于PIP关节（屏幕坐标系y向下），一次向量比较
+        np.less(lm[_FINGER_TIP_IDS, 1], lm[_FINGER_PIP_IDS, 1], out=extended[1:])
+        
+        # 拇指：比较拇指尖与拇指IP的x坐标，根据左右手判断方向
+        if self.handedness == "Right":
+            extended[0] = lm[4, 0] < lm[3, 0]
+        else:
+            extended[0] = lm[4, 0] > lm[3, 0]
+        return extended
+    
+    @property
+    def finger_mask(self) -> int:
+        """五指伸展状态的位掩码 (thumb<<4 | index<<3 | middle<<2 | ring<<1 | pinky)"""
+        return int(self.fingers_extended @ _FINGER_BITS)
     
     def is_finger_extended(self, finger_index: int) -> bool:
         """
         判断手指是否伸展
         finger_index: 0=拇指, 1=食指, 2=中指, 3=无名指, 4=小指
         """
-        if len(self.landmarks) < 21:
-            return False
-        
-        # 各手指关键点索引
-        finger_landmarks = {
-            0: (1, 2, 3, 4),     # 拇指: CMC, MCP, IP, TIP
-            1: (5, 6, 7, 8),     # 食指: MCP, PIP, DIP, TIP
-            2: (9, 10, 11, 12),  # 中指
-            3: (13, 14, 15, 16), # 无名指
-            4: (17, 18, 19, 20)  # 小指
-        }
-        
-        if finger_index not in finger_landmarks:
+        if not 0 <= finger_index < 5:
             return False
-        
-        indices = finger_landmarks[finger_index]
-        
-        if finger_index == 0:  # 拇指使用特殊逻辑
-            # 比较拇指尖与拇指IP的x坐标距离
-            tip = self.landmarks[indices[3]]
-            ip = self.landmarks[indices[2]]
-            mcp = self.landmarks[indices[1]]
-            # 根据左右手判断方向
-            if self.handedness == "Right":
-                return tip[0] < ip[0]
-            else:
-                return tip[0] > ip[0]
-        else:
-            # 其他手指：指尖y坐标小于PIP关节（屏幕坐标系y向下）
-            tip = self.landmarks[indices[3]]
-            pip = self.landmarks[indices[1]]
-            return tip[1] < pip[1]
+        return bool(self.fingers_extended[finger_index])
 
 
 @dataclass
@@ -153,34 +183,38 @@ class GestureEvent:
     def to_dict(self) -> dict:
         """转换为字典"""
         return {
-            'gesture_type': self.gesture_type.name,
+            'gesture_type': _GESTURE_TYPE_NAMES[self.gesture_type],
             'confidence': self.confidence,
             'handedness': self.handedness,
             'position': self.position,
             'screen_position': self.screen_position,
             'timestamp': self.timestamp,
-            'state': self.state.name
+            'state': _GESTURE_STATE_NAMES[self.state]
         }
 
 
 class GestureStateMachine:
     """手势状态机 - 处理防误触逻辑"""
     
-    def __init__(self, hold_time_ms: int = 150, cooldown_ms: int = 700):
+    def __init__(self, hold_time_ms: int = 150, cooldown_ms: int = 700,
+                 clock: Callable[[], float] = time.monotonic):
         self.hold_time_ms = hold_time_ms
         self.cooldown_ms = cooldown_ms
+        # 时钟（秒），测试中可注入虚拟时钟
+        self._clock = clock
         self.current_state = GestureState.IDLE
         self.current_gesture: Optional[GestureType] = None
         self.state_start_time: float = 0
         self.last_trigger_time: float = 0
-        self._gesture_cooldowns: dict = {}
+        # 各手势上次触发时间（毫秒），按 gesture.value 索引，-1 表示从未触发
+        self._gesture_cooldowns = np.full(len(GestureType) + 1, -1, dtype=np.int64)
     
     def update(self, gesture: Optional[GestureType]) -> Tuple[GestureState, bool]:
         """
         更新状态机
         返回: (当前状态, 是否应该触发动作)
         """
-        current_time = time.time() * 1000  # 转换为毫秒
+        current_time = self._clock() * 1000  # 转换为毫秒
         should_trigger = False
         
         if self.current_state == GestureState.IDLE:
@@ -200,10 +234,10 @@ class GestureStateMachine:
         elif self.current_state == GestureState.HOLDING:
             if gesture == self.current_gesture:
                 # 检查是否在冷却期
-                if not self._is_in_cooldown(gesture):
+                if not self._is_in_cooldown(gesture, current_time):
                     self.current_state = GestureState.TRIGGERED
                     should_trigger = True
-                    self._gesture_cooldowns[gesture] = current_time
+                    self._gesture_cooldowns[gesture.value] = int(current_time)
             else:
                 self._reset()
         
@@ -218,13 +252,14 @@ class GestureStateMachine:
         
         return self.current_state, should_trigger
     
-    def _is_in_cooldown(self, gesture: GestureType) -> bool:
+    def _is_in_cooldown(self, gesture: GestureType, current_time: Optional[float] = None) -> bool:
         """检查手势是否在冷却期"""
-        if gesture not in self._gesture_cooldowns:
+        last_trigger = self._gesture_cooldowns[gesture.value]
+        if last_trigger < 0:
             return False
-        current_time = time.time() * 1000
-        elapsed = current_time - self._gesture_cooldowns[gesture]
-        return elapsed < self.cooldown_ms
+        if current_time is None:
+            current_time = self._clock() * 1000
+        return current_time - last_trigger < self.cooldown_ms
     
     def _reset(self):
         """重置状态机"""
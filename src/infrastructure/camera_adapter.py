@@ -8,9 +8,30 @@ import numpy as np
 from typing import Optional, Tuple
 from dataclasses import dataclass
 import logging
+import sys
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# 采集环形缓冲槽位数：处理线程持有的一帧 + 等待取走的最新帧 + 正在写入的一帧；
+# 帧交给下游前已复制出槽位，下游持有多久都不占用槽位
+_FRAME_RING_SLOTS = 3
+
+# 读取失败后的重试间隔（秒）与连续失败上限：摄像头出错或被拔出时不空转占满 CPU，
+# 连续失败达到上限即停止采集
+_READ_RETRY_DELAY = 0.05
+_MAX_READ_FAILURES = 40
+
+
+def _capture_backend() -> int:
+    """按平台选择低延迟的采集后端"""
+    if sys.platform.startswith('win'):
+        return cv2.CAP_MSMF
+    if sys.platform.startswith('linux'):
+        return cv2.CAP_V4L2
+    return cv2.CAP_ANY
+
 
 @dataclass
 class CameraConfig:
@@ -56,11 +77,33 @@ class CameraAdapter:
         
         # ROI区域
         self.roi: Optional[Tuple[int, int, int, int]] = None  # (x, y, w, h)
+        
+        # 融合重映射表缓存（畸变校正+透视+镜像+旋转），参数变化时失效
+        self._remap_maps: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._remap_size: Optional[Tuple[int, int]] = None
+        
+        # OpenCL 可用时使用 UMat 将预处理链卸载到GPU
+        self._use_umat = cv2.ocl.haveOpenCL()
+        if self._use_umat:
+            cv2.ocl.setUseOpenCL(True)
+            logger.info("OpenCL 可用，图像预处理使用 UMat")
+        
+        # 后台采集线程与单槽帧缓冲（只保留最新帧）
+        self._reader: Optional[threading.Thread] = None
+        self._frame_lock = threading.Lock()
+        self._frame_event = threading.Event()
+        self._latest_frame: Optional[np.ndarray] = None
+        
+        # 预分配的采集环形缓冲，cap.read 直接写入槽位，避免每帧分配新数组
+        self._ring: list = [None] * _FRAME_RING_SLOTS
+        self._ring_index = 0
+        # 处理线程正在读取的槽位数组，采集线程写入时跳过（受 _frame_lock 保护）
+        self._held_frame: Optional[np.ndarray] = None
     
     def start(self) -> bool:
         """启动摄像头"""
         try:
-            self.cap = cv2.VideoCapture(self.config.device_id, cv2.CAP_DSHOW)
+            self.cap = cv2.VideoCapture(self.config.device_id, _capture_backend())
             
             # 设置分辨率
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.config.width)
@@ -73,6 +116,12 @@ class CameraAdapter:
                 return False
             
             self.is_running = True
+            
+            # 启动后台采集线程，USB传输与后续处理并行
+            # 采集线程持有 cap 并在退出时释放，避免与仍阻塞在 read 中的线程竞争
+            self._reader = threading.Thread(target=self._reader_loop, args=(self.cap,), daemon=True)
+            self._reader.start()
+            
             logger.info(f"摄像头已启动: {self.config.width}x{self.config.height}@{self.config.fps}fps")
             return True
             
@@ -83,57 +132,145 @@ class CameraAdapter:
     def stop(self):
         """停止摄像头"""
         self.is_running = False
-        if self.cap:
+        with self._frame_lock:
+            reader, self._reader = self._reader, None
+        if reader is not None:
+            # 采集线程退出时自行释放 cap；超时仍未退出（阻塞在 read 中）时交由它稍后释放
+            reader.join(timeout=1)
+            if reader.is_alive():
+                logger.warning("采集线程未在超时内退出，摄像头将在其退出时释放")
+        elif self.cap:
             self.cap.release()
-            self.cap = None
+        self.cap = None
+        
+        # 未退出的旧采集线程只会写入它已取走的槽位数组，随后检查到不再是 _reader 即退出，
+        # 不会碰到这里换上的新环形缓冲
+        with self._frame_lock:
+            self._latest_frame = None
+            self._held_frame = None
+            self._frame_event.clear()
+            self._ring = [None] * _FRAME_RING_SLOTS
+            self._ring_index = 0
         logger.info("摄像头已停止")
     
-    def get_frame(self) -> Optional[np.ndarray]:
-        """获取一帧图像（已处理）"""
+    def _reader_loop(self, cap: cv2.VideoCapture):
+        """
+        后台采集循环 - 持续读取并覆盖最新帧
+        cap 由本线程独占并在退出时释放；stop() 之后本线程即不再是 _reader，
+        即使 read 返回得晚也不会再写入共享状态（包括随后 start() 的新会话）
+        """
+        me = threading.current_thread()
+        failures = 0
+        try:
+            while self.is_running and self._reader is me:
+                # 写入下一个槽位，跳过处理线程持有的槽位；最新帧在上一个槽位，不会被选中。
+                # 处理线程只能取走最新帧，因此选定后持有者的变化不会落到写入槽位上
+                with self._frame_lock:
+                    idx = self._ring_index
+                    if self._ring[idx] is not None and self._ring[idx] is self._held_frame:
+                        idx = (idx + 1) % _FRAME_RING_SLOTS
+                    buf = self._ring[idx]
+                
+                # 首帧或分辨率变化时 read 会重新分配，收编为新槽位
+                ret, frame = cap.read(buf)
+                with self._frame_lock:
+                    if self._reader is not me:
+                        break
+                    if ret:
+                        self._ring[idx] = frame
+                        self._ring_index = (idx + 1) % _FRAME_RING_SLOTS
+                        self._latest_frame = frame
+                        self._frame_event.set()
+                
+                if ret:
+                    failures = 0
+                    continue
+                failures += 1
+                if failures >= _MAX_READ_FAILURES:
+                    logger.error(f"摄像头连续 {failures} 次读取失败，停止采集")
+                    self.is_running = False
+                    break
+                time.sleep(_READ_RETRY_DELAY)
+        finally:
+            cap.release()
+    
+    def _take_latest_frame(self, timeout: float) -> Optional[np.ndarray]:
+        """取出最新帧，没有新帧时最多等待 timeout 秒"""
         if not self.cap or not self.is_running:
             return None
         
-        ret, frame = self.cap.read()
-        if not ret:
+        if not self._frame_event.wait(timeout):
             return None
         
-        # 应用图像处理
-        frame = self._process_frame(frame)
+        with self._frame_lock:
+            frame = self._latest_frame
+            self._latest_frame = None
+            self._held_frame = frame
+            self._frame_event.clear()
         return frame
     
-    def get_raw_frame(self) -> Optional[np.ndarray]:
-        """获取原始帧（未处理）"""
-        if not self.cap or not self.is_running:
+    def _release_frame(self):
+        """处理线程用完槽位，采集线程可以再次写入"""
+        with self._frame_lock:
+            self._held_frame = None
+    
+    def get_frame(self, timeout: float = 0.1) -> Optional[np.ndarray]:
+        """获取一帧图像（已处理），返回的数组归调用方所有"""
+        source = self._take_latest_frame(timeout)
+        if source is None:
             return None
         
-        ret, frame = self.cap.read()
-        return frame if ret else None
+        try:
+            # 应用图像处理
+            frame = self._process_frame(source)
+            # 没有任何变换（或只有 ROI 视图）时结果仍指向环形缓冲槽位，复制出来交给下游
+            if np.may_share_memory(frame, source):
+                frame = frame.copy()
+        finally:
+            self._release_frame()
+        return frame
+    
+    def get_raw_frame(self, timeout: float = 0.1) -> Optional[np.ndarray]:
+        """获取原始帧（未处理），返回槽位的副本"""
+        source = self._take_latest_frame(timeout)
+        if source is None:
+            return None
+        
+        try:
+            return source.copy()
+        finally:
+            self._release_frame()
     
     def _process_frame(self, frame: np.ndarray) -> np.ndarray:
         """处理帧图像"""
-        # 1. 畸变校正
-        if self.camera_matrix is not None and self.dist_coeffs is not None:
-            frame = cv2.undistort(frame, self.camera_matrix, self.dist_coeffs, 
-                                  None, self.new_camera_matrix)
+        h, w = frame.shape[:2]
+        if self._use_umat:
+            frame = cv2.UMat(frame)
         
-        # 2. 透视变换
-        if self.perspective_matrix is not None:
-            h, w = frame.shape[:2]
-            frame = cv2.warpPerspective(frame, self.perspective_matrix, (w, h))
-        
-        # 3. 镜像
-        if self.config.mirror:
-            frame = cv2.flip(frame, 1)
-        
-        # 4. 旋转
-        if self.config.rotation != 0:
-            frame = self._rotate_frame(frame, self.config.rotation)
+        # 1-4. 几何变换
+        if self._needs_remap():
+            # 畸变校正/透视变换生效时，与镜像、旋转融合为一次 remap
+            if self._remap_maps is None or self._remap_size != (w, h):
+                self._remap_maps = self._build_remap(w, h)
+                self._remap_size = (w, h)
+            map1, map2 = self._remap_maps
+            frame = cv2.remap(frame, map1, map2, cv2.INTER_LINEAR)
+        else:
+            # 仅镜像/旋转时直接使用无插值的内存重排，比 remap 更快
+            if self.config.mirror:
+                frame = cv2.flip(frame, 1)
+            if self.config.rotation != 0:
+                frame = self._rotate_frame(frame, self.config.rotation)
         
         # 5. 亮度/对比度调整
         if self.config.brightness != 0 or self.config.contrast != 1.0:
             frame = self._adjust_brightness_contrast(
                 frame, self.config.brightness, self.config.contrast)
         
+        # 下载回CPU内存（后续绘制与MediaPipe需要numpy数组）
+        if isinstance(frame, cv2.UMat):
+            frame = frame.get()
+        
         # 6. ROI裁剪
         if self.roi:
             x, y, w, h = self.roi
@@ -141,6 +278,62 @@ class CameraAdapter:
         
         return frame
     
+    def _needs_remap(self) -> bool:
+        """是否存在需要插值的几何变换"""
+        has_undistort = self.camera_matrix is not None and self.dist_coeffs is not None
+        return has_undistort or self.perspective_matrix is not None
+    
+    def _build_remap(self, w: int, h: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        构建融合重映射表
+        对输出网格依次做旋转、镜像、透视变换的逆映射，
+        最后在畸变校正表上采样，得到输出像素到原始像素的坐标
+        """
+        rotation = self.config.rotation
+        out_w, out_h = (h, w) if rotation in (90, 270) else (w, h)
+        xs, ys = np.meshgrid(np.arange(out_w, dtype=np.float32),
+                             np.arange(out_h, dtype=np.float32))
+        
+        # 旋转的逆映射
+        if rotation == 90:
+            xs, ys = ys, (h - 1) - xs
+        elif rotation == 180:
+            xs, ys = (w - 1) - xs, (h - 1) - ys
+        elif rotation == 270:
+            xs, ys = (w - 1) - ys, xs
+        
+        # 镜像的逆映射
+        if self.config.mirror:
+            xs = (w - 1) - xs
+        
+        # 透视变换的逆映射
+        if self.perspective_matrix is not None:
+            pts = np.stack([xs, ys], axis=-1).reshape(-1, 1, 2)
+            inv = np.linalg.inv(self.perspective_matrix)
+            pts = cv2.perspectiveTransform(pts, inv).reshape(out_h, out_w, 2)
+            xs = np.ascontiguousarray(pts[..., 0])
+            ys = np.ascontiguousarray(pts[..., 1])
+        
+        # 畸变校正：在校正表上按当前坐标采样
+        if self.camera_matrix is not None and self.dist_coeffs is not None:
+            und_x, und_y = cv2.initUndistortRectifyMap(
+                self.camera_matrix, self.dist_coeffs, None,
+                self.new_camera_matrix, (w, h), cv2.CV_32FC1)
+            map_x = cv2.remap(und_x, xs, ys, cv2.INTER_LINEAR,
+                              borderMode=cv2.BORDER_CONSTANT, borderValue=-1)
+            map_y = cv2.remap(und_y, xs, ys, cv2.INTER_LINEAR,
+                              borderMode=cv2.BORDER_CONSTANT, borderValue=-1)
+            xs, ys = map_x, map_y
+        
+        # 转为定点格式，remap 速度更快
+        return cv2.convertMaps(xs.astype(np.float32), ys.astype(np.float32),
+                               cv2.CV_16SC2)
+    
+    def _invalidate_remap(self):
+        """使重映射表缓存失效"""
+        self._remap_maps = None
+        self._remap_size = None
+    
     def _rotate_frame(self, frame: np.ndarray, degrees: int) -> np.ndarray:
         """旋转帧"""
         if degrees == 90:
@@ -153,23 +346,29 @@ class CameraAdapter:
     
     def _adjust_brightness_contrast(self, frame: np.ndarray, 
                                      brightness: float, contrast: float) -> np.ndarray:
-        """调整亮度和对比度"""
-        frame = frame.astype(np.float32)
-        frame = frame * contrast + brightness
-        frame = np.clip(frame, 0, 255).astype(np.uint8)
-        return frame
+        """调整亮度和对比度（单次 uint8→uint8 融合运算）"""
+        if brightness >= 0:
+            # 结果非负时 convertScaleAbs 的取绝对值不影响语义
+            return cv2.convertScaleAbs(frame, alpha=contrast, beta=brightness)
+        # 负亮度需要截断到0而不是取绝对值
+        return cv2.addWeighted(frame, contrast, frame, 0, brightness)
     
     def preprocess_for_detection(self, frame: np.ndarray) -> np.ndarray:
         """
         为手势检测预处理图像
         包括降噪、色彩均衡等
         """
+        if self._use_umat:
+            frame = cv2.UMat(frame)
+        
         # 转换为RGB（MediaPipe需要RGB格式）
         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         
-        # 轻微高斯模糊降噪
-        frame_rgb = cv2.GaussianBlur(frame_rgb, (3, 3), 0)
+        # 轻微降噪（3x3 均值滤波比高斯核更便宜）
+        frame_rgb = cv2.blur(frame_rgb, (3, 3))
         
+        if isinstance(frame_rgb, cv2.UMat):
+            frame_rgb = frame_rgb.get()
         return frame_rgb
     
     def set_calibration(self, camera_matrix: np.ndarray, 
@@ -182,11 +381,13 @@ class CameraAdapter:
         h, w = self.config.height, self.config.width
         self.new_camera_matrix, _ = cv2.getOptimalNewCameraMatrix(
             camera_matrix, dist_coeffs, (w, h), 1, (w, h))
+        self._invalidate_remap()
     
     def set_perspective_transform(self, src_points: np.ndarray, 
                                    dst_points: np.ndarray):
         """设置透视变换"""
         self.perspective_matrix = cv2.getPerspectiveTransform(src_points, dst_points)
+        self._invalidate_remap()
     
     def set_roi(self, x: int, y: int, width: int, height: int):
         """设置ROI区域"""
@@ -199,11 +400,13 @@ class CameraAdapter:
     def set_mirror(self, enabled: bool):
         """设置镜像"""
         self.config.mirror = enabled
+        self._invalidate_remap()
     
     def set_rotation(self, degrees: int):
         """设置旋转角度"""
         if degrees in [0, 90, 180, 270]:
             self.config.rotation = degrees
+            self._invalidate_remap()
     
     @property
     def frame_size(self) -> Tuple[int, int]:
@@ -221,7 +424,7 @@ class CameraAdapter:
         """列出可用摄像头"""
         available = []
         for i in range(max_cameras):
-            cap = cv2.VideoCapture(i, cv2.CAP_DSHOW)
+            cap = cv2.VideoCapture(i, _capture_backend())
             if cap.isOpened():
                 available.append(i)
                 cap.release()
@@ -242,12 +445,29 @@ class SafeZone:
         self.x_max = x_max
         self.y_min = y_min
         self.y_max = y_max
+        self._bounds = np.array([x_min, x_max, y_min, y_max], dtype=np.float32)
     
     def is_inside(self, x: float, y: float) -> bool:
         """检查坐标是否在安全区域内"""
         return (self.x_min <= x <= self.x_max and 
                 self.y_min <= y <= self.y_max)
     
+    def is_inside_batch(self, pts: np.ndarray) -> np.ndarray:
+        """
+        批量检查坐标是否在安全区域内
+        
+        Args:
+            pts: (N, 2) 归一化坐标数组
+        
+        Returns:
+            (N,) bool 数组
+        """
+        pts = np.asarray(pts)
+        x_min, x_max, y_min, y_max = self._bounds
+        xs = pts[:, 0]
+        ys = pts[:, 1]
+        return (xs >= x_min) & (xs <= x_max) & (ys >= y_min) & (ys <= y_max)
+    
     def get_screen_rect(self, screen_width: int, screen_height: int) -> Tuple[int, int, int, int]:
         """获取屏幕像素坐标矩形 (x, y, w, h)"""
         x = int(self.x_min * screen_width)
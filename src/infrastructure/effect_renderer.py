@@ -4,10 +4,9 @@ Effect Renderer - 特效渲染器
 """
 
 import math
-import random
 import time
 from typing import Tuple, List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import logging
 
 import numpy as np
@@ -18,12 +17,29 @@ except ImportError:
     cv2 = None
 
 from ..domain.effect import (
-    EffectType, Particle, EffectConfig, 
-    HeartCurve, ParticlePool
+    EffectType, EffectConfig, 
+    HeartCurve, ParticlePool, pack_rgb
 )
+from ..domain import effect_kernels
 
 logger = logging.getLogger(__name__)
 
+# 星空心心内层使用的亮色（打包为 0x00RRGGBB）
+_BRIGHT_COLORS_U32 = np.array([
+    pack_rgb(255, 182, 193),  # 浅粉
+    pack_rgb(255, 192, 203),  # 粉红
+    pack_rgb(255, 255, 255),  # 白色闪烁
+    pack_rgb(255, 218, 233),  # 淡粉
+], dtype=np.uint32)
+
+# 光晕缓冲的降采样倍数与模糊半径（低分辨率像素）
+_GLOW_DOWNSCALE = 4
+_GLOW_SIGMA = 2.0
+# 点累加增益：使模糊后的峰值亮度与原四层同心圆光晕（约 0.31·alpha·color）相当
+_GLOW_SPLAT_GAIN = 0.3125 * 2 * math.pi * _GLOW_SIGMA ** 2
+# 光晕叠加不透明度
+_GLOW_OPACITY = 0.85
+
 
 @dataclass
 class ActiveEffect:
@@ -32,8 +48,14 @@ class ActiveEffect:
     config: EffectConfig
     start_time: float
     center: Tuple[float, float]
-    particles: List[Particle]
+    slots: np.ndarray        # 该特效生成的粒子槽位（粒子按生命周期自行回收）
     is_finished: bool = False
+    elapsed: float = 0.0     # 由每帧 dt 累加的已运行时长（秒）
+    duration_sec: float = field(init=False)
+    
+    def __post_init__(self):
+        # 预先换算时长，避免每帧做除法
+        self.duration_sec = self.config.duration_ms / 1000
 
 
 class EffectRenderer:
@@ -44,10 +66,20 @@ class EffectRenderer:
         self.particle_pool = ParticlePool(max_particles)
         self.active_effects: List[ActiveEffect] = []
         self.effect_configs: dict = {}
+        self._rng = np.random.default_rng()
+        
+        # 4角星/5角星的单位顶点模板（外顶点半径1，内顶点半径0.4）
+        self._star4 = self._build_star_template(4, 0.4)
+        self._star5 = self._build_star_template(5, 0.4)
+        # render_star_shape 使用的5角星模板（内顶点半径0.5）
+        self._star5_half = self._build_star_template(5, 0.5)
+        
+        # 提前编译粒子内核，避免首次触发特效时卡顿
+        effect_kernels.warmup()
         
         # 性能监控
         self.target_fps = 30
-        self.last_frame_time = time.time()
+        self.last_frame_time = time.perf_counter()
         self.fps_adaptive = True
         
         logger.info("特效渲染器已初始化")
@@ -85,24 +117,22 @@ class EffectRenderer:
             return
         
         # 创建特效实例
-        particles = self._create_particles(config, center)
+        slots = self._create_particles(config, center)
         
         effect = ActiveEffect(
             effect_type=config.effect_type,
             config=config,
-            start_time=time.time(),
+            start_time=time.perf_counter(),
             center=center,
-            particles=particles
+            slots=slots
         )
         
         self.active_effects.append(effect)
         logger.debug(f"触发特效: {effect_name} 在位置 {center}")
     
     def _create_particles(self, config: EffectConfig, 
-                          center: Tuple[float, float]) -> List[Particle]:
-        """创建粒子"""
-        particles = []
-        
+                          center: Tuple[float, float]) -> np.ndarray:
+        """创建粒子，返回槽位下标数组"""
         # 根据FPS自动调整粒子数量
         particle_count = config.particle_count
         if self.fps_adaptive:
@@ -110,165 +140,164 @@ class EffectRenderer:
             if current_fps < self.target_fps * 0.8:
                 particle_count = int(particle_count * 0.6)
         
-        for i in range(particle_count):
-            particle = self.particle_pool.acquire(center[0], center[1])
-            
-            if config.effect_type == EffectType.STAR_HEART:
-                self._init_star_heart_particle(particle, config, center, i, particle_count)
-            elif config.effect_type == EffectType.RIPPLE:
-                self._init_ripple_particle(particle, config, center, i, particle_count)
-            elif config.effect_type == EffectType.SPARKLE:
-                self._init_sparkle_particle(particle, config, center)
-            else:
-                self._init_default_particle(particle, config, center)
-            
-            particles.append(particle)
+        slots = self.particle_pool.acquire_batch(particle_count, center[0], center[1])
+        if particle_count == 0:
+            return slots
         
-        return particles
+        if config.effect_type == EffectType.STAR_HEART:
+            self._spawn_star_heart_batch(slots, config, center)
+        elif config.effect_type == EffectType.RIPPLE:
+            self._spawn_ripple_batch(slots, config, center)
+        elif config.effect_type == EffectType.SPARKLE:
+            self._spawn_sparkle_batch(slots, config, center)
+        else:
+            self._spawn_default_batch(slots, config, center)
+        
+        return slots
+    
+    def _pick_colors(self, config: EffectConfig, n: int, fallback: int) -> np.ndarray:
+        """从配置颜色表中随机选取 n 个打包颜色"""
+        table = config.colors_arr
+        if len(table) == 0:
+            return np.full(n, fallback, dtype=np.uint32)
+        return table[self._rng.integers(len(table), size=n)]
     
-    def _init_star_heart_particle(self, particle: Particle, config: EffectConfig,
-                                   center: Tuple[float, float], index: int, total: int):
-        """初始化星空心心粒子 - 优化版"""
-        # 多层心形分布：内层密集 + 外层扩散 + 随机星星
+    def _spawn_star_heart_batch(self, slots: np.ndarray, config: EffectConfig,
+                                center: Tuple[float, float]):
+        """批量初始化星空心心粒子 - 多层心形分布：内层密集 + 外层扩散 + 随机星星"""
+        soa = self.particle_pool.soa
+        rng = self._rng
+        total = len(slots)
+        cx, cy = center
+        
+        index = np.arange(total)
         layer = index % 4  # 4层结构
-        layer_ratio = index / total
-        
-        if layer == 0:
-            # 第一层：心形轮廓上的粒子（密集）
-            t = 2 * math.pi * (index / (total / 4))
-            scale = config.scale / 800
-            heart_point = HeartCurve.get_point(t, scale=scale, center=center)
-            offset = random.uniform(-0.008, 0.008)
-            particle.x = heart_point[0] + offset
-            particle.y = heart_point[1] + offset
-            particle.size = random.uniform(3, 6)
-            # 较慢的向外扩散
-            angle = math.atan2(heart_point[1] - center[1], heart_point[0] - center[0])
-            speed = random.uniform(0.002, 0.008)
-            particle.vx = math.cos(angle) * speed
-            particle.vy = math.sin(angle) * speed
-            
-        elif layer == 1:
-            # 第二层：内部填充的小星星
-            t = random.uniform(0, 2 * math.pi)
-            # 在心形内部随机分布
-            r = random.uniform(0.3, 0.9)
-            scale = config.scale / 800 * r
-            heart_point = HeartCurve.get_point(t, scale=scale, center=center)
-            particle.x = heart_point[0] + random.uniform(-0.015, 0.015)
-            particle.y = heart_point[1] + random.uniform(-0.015, 0.015)
-            particle.size = random.uniform(2, 4)
-            # 随机漂浮
-            particle.vx = random.uniform(-0.003, 0.003)
-            particle.vy = random.uniform(-0.005, 0.001)  # 轻微上浮
-            
-        elif layer == 2:
-            # 第三层：外围扩散的发光粒子
-            t = 2 * math.pi * (index / (total / 4))
-            scale = config.scale / 600
-            heart_point = HeartCurve.get_point(t, scale=scale, center=center)
-            particle.x = heart_point[0]
-            particle.y = heart_point[1]
-            particle.size = random.uniform(4, 8)
-            # 向外扩散
-            angle = math.atan2(heart_point[1] - center[1], heart_point[0] - center[0])
-            speed = random.uniform(0.01, 0.025)
-            particle.vx = math.cos(angle) * speed + random.uniform(-0.005, 0.005)
-            particle.vy = math.sin(angle) * speed + random.uniform(-0.005, 0.005)
-            particle.glow = True
-            
-        else:
-            # 第四层：随机分布的闪烁星星（背景）
-            # 在心形周围随机分布
-            angle = random.uniform(0, 2 * math.pi)
-            dist = random.uniform(0.05, 0.18)
-            particle.x = center[0] + math.cos(angle) * dist
-            particle.y = center[1] + math.sin(angle) * dist
-            particle.size = random.uniform(1, 3)
-            # 轻微飘动
-            particle.vx = random.uniform(-0.002, 0.002)
-            particle.vy = random.uniform(-0.004, 0.001)
-            particle.twinkle = True
-            particle.twinkle_speed = random.uniform(3, 8)
-        
-        # 设置颜色 - 根据层次选择不同颜色
-        if layer <= 1:
-            # 内层用更亮的颜色
-            bright_colors = [
-                (255, 182, 193),  # 浅粉
-                (255, 192, 203),  # 粉红
-                (255, 255, 255),  # 白色闪烁
-                (255, 218, 233),  # 淡粉
-            ]
-            particle.color = random.choice(bright_colors)
-        else:
-            # 外层用配置颜色
-            particle.color = random.choice(config.colors) if config.colors else (255, 105, 180)
+        # 轮廓层：t = 2π·index/(total/4) 的单位心形点，按粒子数缓存
+        outline = HeartCurve.unit_points(total, 4)
+        ox, oy = outline[:, 0], outline[:, 1]
+        
+        # 第一层：心形轮廓上的粒子（密集），较慢的向外扩散
+        i0 = index[layer == 0]
+        s0 = slots[i0]
+        n0 = len(i0)
+        scale0 = config.scale / 800
+        hx = cx + ox[i0] * scale0
+        hy = cy + oy[i0] * scale0
+        offset = rng.uniform(-0.008, 0.008, n0)
+        soa.x[s0] = hx + offset
+        soa.y[s0] = hy + offset
+        soa.size[s0] = rng.uniform(3, 6, n0)
+        angle = np.arctan2(hy - cy, hx - cx)
+        speed = rng.uniform(0.002, 0.008, n0)
+        soa.vx[s0] = np.cos(angle) * speed
+        soa.vy[s0] = np.sin(angle) * speed
+        
+        # 第二层：在心形内部随机分布的小星星，随机漂浮、轻微上浮
+        s1 = slots[layer == 1]
+        n1 = len(s1)
+        t = rng.uniform(0, 2 * math.pi, n1)
+        scale = config.scale / 800 * rng.uniform(0.3, 0.9, n1)
+        hx, hy = HeartCurve.batch(t, scale, center)
+        soa.x[s1] = hx + rng.uniform(-0.015, 0.015, n1)
+        soa.y[s1] = hy + rng.uniform(-0.015, 0.015, n1)
+        soa.size[s1] = rng.uniform(2, 4, n1)
+        soa.vx[s1] = rng.uniform(-0.003, 0.003, n1)
+        soa.vy[s1] = rng.uniform(-0.005, 0.001, n1)
+        
+        # 第三层：外围向外扩散的发光粒子
+        i2 = index[layer == 2]
+        s2 = slots[i2]
+        n2 = len(i2)
+        scale2 = config.scale / 600
+        hx = cx + ox[i2] * scale2
+        hy = cy + oy[i2] * scale2
+        soa.x[s2] = hx
+        soa.y[s2] = hy
+        soa.size[s2] = rng.uniform(4, 8, n2)
+        angle = np.arctan2(hy - cy, hx - cx)
+        speed = rng.uniform(0.01, 0.025, n2)
+        soa.vx[s2] = np.cos(angle) * speed + rng.uniform(-0.005, 0.005, n2)
+        soa.vy[s2] = np.sin(angle) * speed + rng.uniform(-0.005, 0.005, n2)
+        soa.glow[s2] = config.glow_enabled
+        
+        # 第四层：在心形周围随机分布的闪烁星星（背景）
+        s3 = slots[layer == 3]
+        n3 = len(s3)
+        angle = rng.uniform(0, 2 * math.pi, n3)
+        dist = rng.uniform(0.05, 0.18, n3)
+        soa.x[s3] = cx + np.cos(angle) * dist
+        soa.y[s3] = cy + np.sin(angle) * dist
+        soa.size[s3] = rng.uniform(1, 3, n3)
+        soa.vx[s3] = rng.uniform(-0.002, 0.002, n3)
+        soa.vy[s3] = rng.uniform(-0.004, 0.001, n3)
+        soa.twinkle[s3] = config.twinkle_enabled
+        
+        # 颜色和生命周期：内层用更亮的颜色、更长的寿命，外层用配置颜色
+        inner = layer <= 1
+        colors = self._pick_colors(config, total, 0xFF69B4)
+        colors[inner] = _BRIGHT_COLORS_U32[rng.integers(len(_BRIGHT_COLORS_U32), size=int(inner.sum()))]
+        soa.color[slots] = colors
         
-        # 设置生命周期 - 内层更长
         base_lifetime = config.duration_ms / 1000
-        if layer <= 1:
-            particle.lifetime = base_lifetime * random.uniform(0.8, 1.0)
-        else:
-            particle.lifetime = base_lifetime * random.uniform(0.5, 0.9)
-        
-        # 设置旋转
-        particle.rotation = random.uniform(0, 360)
-        particle.rotation_speed = random.uniform(-90, 90)
-        
-        # 发光和闪烁
-        if not hasattr(particle, 'glow') or layer == 2:
-            particle.glow = config.glow_enabled
-        if not hasattr(particle, 'twinkle') or layer == 3:
-            particle.twinkle = config.twinkle_enabled
-        particle.twinkle_speed = config.twinkle_speed
-    
-    def _init_ripple_particle(self, particle: Particle, config: EffectConfig,
-                               center: Tuple[float, float], index: int, total: int):
-        """初始化波纹粒子"""
-        # 圆形分布
-        angle = 2 * math.pi * index / total
-        radius = random.uniform(0.01, 0.05)
+        soa.lifetime[slots] = base_lifetime * np.where(
+            inner, rng.uniform(0.8, 1.0, total), rng.uniform(0.5, 0.9, total))
         
-        particle.x = center[0] + math.cos(angle) * radius
-        particle.y = center[1] + math.sin(angle) * radius
+        # 旋转与闪烁速度
+        soa.rotation[slots] = rng.uniform(0, 360, total)
+        soa.rotation_speed[slots] = rng.uniform(-90, 90, total)
+        soa.twinkle_speed[slots] = config.twinkle_speed
+    
+    def _spawn_ripple_batch(self, slots: np.ndarray, config: EffectConfig,
+                            center: Tuple[float, float]):
+        """批量初始化波纹粒子 - 圆形分布，向外扩散"""
+        soa = self.particle_pool.soa
+        n = len(slots)
+        angle = 2 * math.pi * np.arange(n) / n
+        radius = self._rng.uniform(0.01, 0.05, n)
+        cos_a, sin_a = np.cos(angle), np.sin(angle)
+        
+        soa.x[slots] = center[0] + cos_a * radius
+        soa.y[slots] = center[1] + sin_a * radius
         
-        # 向外扩散
         speed = 0.05
-        particle.vx = math.cos(angle) * speed
-        particle.vy = math.sin(angle) * speed
+        soa.vx[slots] = cos_a * speed
+        soa.vy[slots] = sin_a * speed
         
-        particle.size = 2
-        particle.color = random.choice(config.colors) if config.colors else (100, 149, 237)
-        particle.lifetime = config.duration_ms / 1000
+        soa.size[slots] = 2
+        soa.color[slots] = self._pick_colors(config, n, 0x6495ED)
+        soa.lifetime[slots] = config.duration_ms / 1000
     
-    def _init_sparkle_particle(self, particle: Particle, config: EffectConfig,
-                                center: Tuple[float, float]):
-        """初始化火花粒子"""
-        # 随机爆发
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(0.05, 0.15)
-        
-        particle.x = center[0]
-        particle.y = center[1]
-        particle.vx = math.cos(angle) * speed
-        particle.vy = math.sin(angle) * speed
-        particle.ay = 0.01  # 重力
-        
-        particle.size = random.uniform(2, 5)
-        particle.color = random.choice(config.colors) if config.colors else (255, 255, 0)
-        particle.lifetime = config.duration_ms / 1000 * random.uniform(0.5, 1.0)
+    def _spawn_sparkle_batch(self, slots: np.ndarray, config: EffectConfig,
+                             center: Tuple[float, float]):
+        """批量初始化火花粒子 - 从中心随机爆发，受重力影响"""
+        soa = self.particle_pool.soa
+        rng = self._rng
+        n = len(slots)
+        angle = rng.uniform(0, 2 * math.pi, n)
+        speed = rng.uniform(0.05, 0.15, n)
+        
+        soa.vx[slots] = np.cos(angle) * speed
+        soa.vy[slots] = np.sin(angle) * speed
+        soa.ay[slots] = 0.01  # 重力
+        
+        soa.size[slots] = rng.uniform(2, 5, n)
+        soa.color[slots] = self._pick_colors(config, n, 0xFFFF00)
+        soa.lifetime[slots] = config.duration_ms / 1000 * rng.uniform(0.5, 1.0, n)
     
-    def _init_default_particle(self, particle: Particle, config: EffectConfig,
-                                center: Tuple[float, float]):
-        """初始化默认粒子"""
-        particle.x = center[0] + random.uniform(-0.1, 0.1)
-        particle.y = center[1] + random.uniform(-0.1, 0.1)
-        particle.vx = random.uniform(-0.02, 0.02)
-        particle.vy = random.uniform(-0.02, 0.02)
-        particle.size = random.uniform(3, 6)
-        particle.color = random.choice(config.colors) if config.colors else (255, 255, 255)
-        particle.lifetime = config.duration_ms / 1000
+    def _spawn_default_batch(self, slots: np.ndarray, config: EffectConfig,
+                             center: Tuple[float, float]):
+        """批量初始化默认粒子"""
+        soa = self.particle_pool.soa
+        rng = self._rng
+        n = len(slots)
+        
+        soa.x[slots] = center[0] + rng.uniform(-0.1, 0.1, n)
+        soa.y[slots] = center[1] + rng.uniform(-0.1, 0.1, n)
+        soa.vx[slots] = rng.uniform(-0.02, 0.02, n)
+        soa.vy[slots] = rng.uniform(-0.02, 0.02, n)
+        soa.size[slots] = rng.uniform(3, 6, n)
+        soa.color[slots] = self._pick_colors(config, n, 0xFFFFFF)
+        soa.lifetime[slots] = config.duration_ms / 1000
     
     def update(self, dt: float):
         """
@@ -277,34 +306,27 @@ class EffectRenderer:
         Args:
             dt: 时间增量（秒）
         """
-        current_time = time.time()
+        # 每帧只读一次时钟，特效时长由 dt 累加，不再逐特效读取墙钟
+        current_time = time.perf_counter()
+        
+        # 一次向量化更新所有粒子，死亡粒子由对象池回收
+        self.particle_pool.update_all(dt)
         
-        # 更新所有活跃特效
-        finished_effects = []
+        # 单次遍历重建活跃特效列表（粒子生命周期不超过特效时长，已随 update_all 回收）
+        kept = []
         for effect in self.active_effects:
-            elapsed = current_time - effect.start_time
-            
-            # 更新粒子
-            for particle in effect.particles:
-                particle.update(dt)
-            
-            # 检查特效是否结束
-            duration_sec = effect.config.duration_ms / 1000
-            if elapsed > duration_sec:
+            effect.elapsed += dt
+            if effect.elapsed > effect.duration_sec:
                 effect.is_finished = True
-                finished_effects.append(effect)
-        
-        # 清理结束的特效
-        for effect in finished_effects:
-            for particle in effect.particles:
-                self.particle_pool.release(particle)
-            self.active_effects.remove(effect)
+            else:
+                kept.append(effect)
+        self.active_effects = kept
         
         self.last_frame_time = current_time
     
     def render(self, frame: np.ndarray) -> np.ndarray:
         """
-        渲染特效到帧 - 优化版
+        渲染特效到帧 - 优化版，直接在传入的帧上绘制
         
         Args:
             frame: BGR格式的图像帧
@@ -312,94 +334,100 @@ class EffectRenderer:
         Returns:
             渲染后的帧
         """
-        if cv2 is None or not self.active_effects:
+        if cv2 is None or self.particle_pool.active_count == 0:
             return frame
         
         h, w = frame.shape[:2]
         
-        # 创建透明叠加层
-        overlay = frame.copy()
-        
-        # 先绘制发光层（底层）
-        glow_layer = np.zeros_like(frame, dtype=np.float32)
-        
-        for effect in self.active_effects:
-            # 计算特效进度
-            elapsed = time.time() - effect.start_time
-            progress = min(elapsed / (effect.config.duration_ms / 1000), 1.0)
-            
-            for particle in effect.particles:
-                if not particle.is_alive:
-                    continue
-                
-                # 转换坐标
-                px = int(particle.x * w)
-                py = int(particle.y * h)
-                
-                # 检查边界
-                if px < 5 or px >= w - 5 or py < 5 or py >= h - 5:
-                    continue
-                
-                # 获取颜色（BGR格式）
-                color = (particle.color[2], particle.color[1], particle.color[0])
-                
-                # 计算透明度
-                alpha = particle.alpha
-                
-                # 闪烁效果
-                if particle.twinkle:
-                    twinkle_factor = 0.5 + 0.5 * math.sin(particle.age * particle.twinkle_speed)
-                    alpha *= twinkle_factor
-                
-                # 粒子大小
-                size = max(1, int(particle.size * alpha))
-                
-                # 发光效果
-                if particle.glow and size >= 2:
-                    # 柔和的多层发光
-                    for i in range(4, 0, -1):
-                        glow_size = size + i * 3
-                        glow_intensity = alpha * 0.15 / i
-                        glow_color = tuple(c * glow_intensity for c in color)
-                        cv2.circle(glow_layer, (px, py), glow_size, glow_color, -1, cv2.LINE_AA)
-                
-                # 绘制主体粒子
-                if size >= 3:
-                    # 大粒子绘制星形
-                    self._draw_star(overlay, (px, py), size, color, particle.rotation, alpha)
-                else:
-                    # 小粒子绘制圆点
-                    cv2.circle(overlay, (px, py), size, color, -1, cv2.LINE_AA)
-        
-        # 混合发光层
-        glow_layer = np.clip(glow_layer, 0, 255).astype(np.uint8)
-        overlay = cv2.add(overlay, glow_layer)
-        
-        # 混合叠加层
-        frame = cv2.addWeighted(overlay, 0.85, frame, 0.15, 0)
+        # 向量化可见性剔除：只保留存活且在画面内的粒子
+        soa = self.particle_pool.soa
+        # 更新内核已在 age >= lifetime 时清除 alive 标志，直接以 bool 视图读取掩码，无需再逐个比较浮点数
+        alive = soa.alive.view(np.bool_)
+        px_all = (soa.x * w).astype(np.int32)
+        py_all = (soa.y * h).astype(np.int32)
+        in_bounds = (px_all >= 5) & (px_all < w - 5) & (py_all >= 5) & (py_all < h - 5)
+        visible = np.flatnonzero(alive & in_bounds)
+        
+        px_v = px_all[visible]
+        py_v = py_all[visible]
+        # 打包颜色一次性解包为 BGR 表
+        color_v = soa.color[visible]
+        bgr_v = np.stack([color_v & 0xFF, (color_v >> 8) & 0xFF, (color_v >> 16) & 0xFF], axis=1)
+        
+        # 闪烁效果：只对闪烁粒子计算正弦相位，没有闪烁粒子时整段跳过
+        alpha_v = soa.alpha[visible]
+        twinkle_sel = np.flatnonzero(soa.twinkle[visible])
+        if twinkle_sel.size:
+            tw = visible[twinkle_sel]
+            alpha_v[twinkle_sel] *= 0.5 + 0.5 * np.sin(soa.age[tw] * soa.twinkle_speed[tw])
+        
+        # 粒子大小
+        size_v = np.maximum(1, (soa.size[visible] * alpha_v).astype(np.int32))
+        
+        # 发光效果：在低分辨率缓冲中按点累加，再用一次高斯模糊扩散成光晕
+        glow_sel = np.flatnonzero(soa.glow[visible].astype(bool) & (size_v >= 2))
+        glow_small = None
+        if glow_sel.size:
+            gh, gw = max(1, h // _GLOW_DOWNSCALE), max(1, w // _GLOW_DOWNSCALE)
+            glow_small = np.zeros((gh, gw, 3), dtype=np.float32)
+            bgr = bgr_v[glow_sel].astype(np.float32)
+            gy = np.minimum(py_v[glow_sel] // _GLOW_DOWNSCALE, gh - 1)
+            gx = np.minimum(px_v[glow_sel] // _GLOW_DOWNSCALE, gw - 1)
+            np.add.at(glow_small, (gy, gx), bgr * (alpha_v[glow_sel, None] * _GLOW_SPLAT_GAIN))
+            glow_small = cv2.GaussianBlur(glow_small, (0, 0), sigmaX=_GLOW_SIGMA)
+        
+        # 小粒子绘制圆点
+        small = np.flatnonzero(size_v < 3)
+        for px, py, color, size in zip(px_v[small].tolist(), py_v[small].tolist(),
+                                       bgr_v[small].tolist(), size_v[small].tolist()):
+            cv2.circle(frame, (px, py), size, color, -1, cv2.LINE_AA)
+        
+        # 大粒子绘制星形：顶点在循环外一次性算好，循环内只剩 fillPoly
+        large = np.flatnonzero(size_v >= 3)
+        if large.size:
+            star_colors = (bgr_v[large] * alpha_v[large, None]).astype(np.int32)
+            polys = self._star_polygons(px_v[large], py_v[large], size_v[large],
+                                        soa.rotation[visible[large]])
+            for poly, color in zip(polys, star_colors.tolist()):
+                cv2.fillPoly(frame, [poly], color, cv2.LINE_AA)
+        
+        # 混合发光层：在低分辨率下完成缩放与饱和转换，放大后一次饱和加到帧上
+        if glow_small is not None:
+            glow = cv2.convertScaleAbs(glow_small, alpha=_GLOW_OPACITY)
+            glow = cv2.resize(glow, (w, h), interpolation=cv2.INTER_LINEAR)
+            cv2.add(frame, glow, dst=frame)
         
         return frame
     
-    def _draw_star(self, frame: np.ndarray, center: Tuple[int, int], 
-                   size: int, color: Tuple[int, int, int], 
-                   rotation: float, alpha: float):
-        """绘制星形粒子"""
-        # 生成4角星/5角星顶点
-        points_count = 4 if size < 5 else 5
-        points = []
-        
-        for i in range(points_count * 2):
-            angle = math.radians(rotation) + i * math.pi / points_count - math.pi / 2
-            r = size if i % 2 == 0 else size * 0.4
-            x = int(center[0] + r * math.cos(angle))
-            y = int(center[1] + r * math.sin(angle))
-            points.append([x, y])
-        
-        points = np.array(points, dtype=np.int32)
-        
-        # 绘制填充星形
-        adjusted_color = tuple(int(c * alpha) for c in color)
-        cv2.fillPoly(frame, [points], adjusted_color, cv2.LINE_AA)
+    @staticmethod
+    def _build_star_template(points_count: int, inner_ratio: float) -> np.ndarray:
+        """生成星形的单位顶点模板，外顶点与内顶点交替"""
+        i = np.arange(points_count * 2)
+        angle = i * math.pi / points_count - math.pi / 2
+        r = np.where(i % 2 == 0, 1.0, inner_ratio)
+        return np.stack([r * np.cos(angle), r * np.sin(angle)], axis=1).astype(np.float32)
+    
+    def _star_polygons(self, px: np.ndarray, py: np.ndarray,
+                       sizes: np.ndarray, rotation: np.ndarray) -> List[np.ndarray]:
+        """批量计算星形顶点（小于5像素用4角星，否则5角星），按输入顺序返回"""
+        theta = np.radians(rotation).astype(np.float32)
+        cos_r = np.cos(theta) * sizes
+        sin_r = np.sin(theta) * sizes
+        centers = np.stack([px, py], axis=1).astype(np.float32)
+        
+        polys: List[np.ndarray] = [None] * len(sizes)
+        for template, sel in ((self._star4, sizes < 5), (self._star5, sizes >= 5)):
+            idx = np.flatnonzero(sel)
+            if not idx.size:
+                continue
+            # 模板旋转、缩放后平移到中心：(n, k, 2)
+            tx, ty = template[:, 0], template[:, 1]
+            c, s = cos_r[idx, None], sin_r[idx, None]
+            pts = np.stack([tx * c - ty * s, tx * s + ty * c], axis=2)
+            pts += centers[idx, None, :]
+            for i, poly in zip(idx.tolist(), pts.astype(np.int32)):
+                polys[i] = poly
+        return polys
     
     def render_star_shape(self, frame: np.ndarray, center: Tuple[int, int], 
                           size: int, color: Tuple[int, int, int], 
@@ -410,31 +438,23 @@ class EffectRenderer:
         if cv2 is None:
             return frame
         
-        # 生成5角星顶点
-        points = []
-        for i in range(10):
-            angle = rotation + i * math.pi / 5 - math.pi / 2
-            r = size if i % 2 == 0 else size / 2
-            x = int(center[0] + r * math.cos(angle))
-            y = int(center[1] + r * math.sin(angle))
-            points.append([x, y])
-        
-        points = np.array(points, dtype=np.int32)
+        # 旋转缩放预计算的单位模板：只需一次 cos/sin
+        c, s = math.cos(rotation) * size, math.sin(rotation) * size
+        tx, ty = self._star5_half[:, 0], self._star5_half[:, 1]
+        points = np.stack([center[0] + tx * c - ty * s,
+                           center[1] + tx * s + ty * c], axis=1).astype(np.int32)
         cv2.fillPoly(frame, [points], color)
         
         return frame
     
     def _estimate_fps(self) -> float:
         """估算当前FPS"""
-        current_time = time.time()
-        dt = current_time - self.last_frame_time
+        dt = time.perf_counter() - self.last_frame_time
         return 1.0 / dt if dt > 0 else 60
     
     def clear_all_effects(self):
         """清除所有特效"""
-        for effect in self.active_effects:
-            for particle in effect.particles:
-                self.particle_pool.release(particle)
+        self.particle_pool.clear_active()
         self.active_effects.clear()
     
     def get_active_particle_count(self) -> int:
@@ -4,10 +4,9 @@ MediaPipe Adapter - MediaPipe 手势识别适配器
 """
 
 import numpy as np
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
 import logging
-import math
-from collections import deque
+import threading
 import time
 
 try:
@@ -23,6 +22,51 @@ from ..domain.gesture import (
 
 logger = logging.getLogger(__name__)
 
+# 归一化距离阈值（均为平方值，直接与平方距离比较）
+_OK_TIP_DIST_SQ = 0.05 ** 2               # OK手势：拇指与食指尖
+_HEART_TIP_DIST_SQ = 0.08 ** 2            # 单手比心：拇指与食指尖
+_DOUBLE_HEART_INDEX_DIST_SQ = 0.1 ** 2    # 双手比心：两食指尖
+_DOUBLE_HEART_THUMB_DIST_SQ = 0.15 ** 2   # 双手比心：两拇指尖
+
+# 动态手势位置历史：环形缓冲区长度与滑动判定窗口
+_HISTORY_LEN = 20
+_SWIPE_WINDOW = 10
+
+# 手部骨骼连线（关键点索引对），用于 draw_landmarks
+_HAND_CONNECTIONS = np.array([
+    # 拇指
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    # 食指
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    # 中指
+    (9, 10), (10, 11), (11, 12),
+    # 无名指
+    (13, 14), (14, 15), (15, 16),
+    # 小指
+    (0, 17), (17, 18), (18, 19), (19, 20),
+    # 手掌
+    (5, 9), (9, 13), (13, 17)
+], dtype=np.intp)
+
+# 手指位掩码 -> 静态手势（位顺序：拇指、食指、中指、无名指、小指）
+_FINGER_MASK_GESTURES = {
+    0b00000: GestureType.FIST,            # 握拳：所有手指都收起
+    0b11111: GestureType.FIVE_FINGERS,    # 五指张开
+    0b01000: GestureType.ONE_FINGER,      # 单指（食指），拇指不限
+    0b11000: GestureType.ONE_FINGER,
+    0b01100: GestureType.TWO_FINGERS,     # 双指（剪刀手），拇指不限
+    0b11100: GestureType.TWO_FINGERS,
+    0b01110: GestureType.THREE_FINGERS,   # 三指，拇指不限
+    0b11110: GestureType.THREE_FINGERS,
+    0b01111: GestureType.FOUR_FINGERS,    # 四指：拇指收起
+}
+# 需在OK手势检测之后才判断的掩码
+_FINGER_MASK_GESTURES_AFTER_OK = {
+    0b10000: GestureType.THUMBS_UP,       # 点赞：只有拇指伸展
+    0b01001: GestureType.ROCK,            # 摇滚手势，拇指不限
+    0b11001: GestureType.ROCK,
+}
+
 
 class MediaPipeAdapter:
     """MediaPipe 手势识别适配器"""
@@ -30,7 +74,10 @@ class MediaPipeAdapter:
     def __init__(self, 
                  max_num_hands: int = 2,
                  min_detection_confidence: float = 0.7,
-                 min_tracking_confidence: float = 0.5):
+                 min_tracking_confidence: float = 0.5,
+                 async_mode: bool = True,
+                 inference_max_width: int = 640,
+                 infer_every: int = 2):
         
         if mp is None:
             raise RuntimeError("MediaPipe 未安装")
@@ -50,18 +97,41 @@ class MediaPipeAdapter:
         self.state_machine = GestureStateMachine()
         
         # 动态手势检测历史
-        self._position_history: deque = deque(maxlen=20)
-        self._last_positions: dict = {}  # 每只手的历史位置
+        # 每只手一个 (x, y, t) 环形缓冲区，head 为下一个写入位置，count 为有效条数
+        self._hist: Dict[str, np.ndarray] = {}
+        self._head: Dict[str, int] = {}
+        self._count: Dict[str, int] = {}
         
         # 上一次检测结果
         self._last_landmarks: List[HandLandmarks] = []
         self._last_gesture: Optional[GestureType] = None
         
+        # 推理输入的最大宽度，超出时先等比缩小（关键点为归一化坐标，无需换算）；0 表示不缩放
+        self.inference_max_width = inference_max_width
+        
+        # 跳帧推理：每 infer_every 帧推理一次，中间帧外推关键点
+        self.infer_every = max(1, infer_every)
+        self._frame_counter = 0
+        self._frames_since_detect = 0
+        self._detected: List[HandLandmarks] = []
+        self._prev_detected: List[HandLandmarks] = []
+        
+        # 异步识别：后台线程只处理最新一帧，调用方非阻塞地读取最近结果
+        self.async_mode = async_mode
+        self._worker: Optional[threading.Thread] = None
+        self._running = False
+        self._input_lock = threading.Lock()
+        self._input_event = threading.Event()
+        self._pending_frame: Optional[np.ndarray] = None
+        self._result_lock = threading.Lock()
+        self._pending_event: Optional[GestureEvent] = None
+        
         logger.info("MediaPipe 手势识别适配器已初始化")
     
     def process_frame(self, frame: np.ndarray) -> Tuple[List[HandLandmarks], Optional[GestureEvent]]:
         """
         处理视频帧，检测手部并识别手势
+        异步模式下立即返回最近一次识别结果，手势事件只返回一次
         
         Args:
             frame: RGB格式的图像帧
@@ -69,20 +139,63 @@ class MediaPipeAdapter:
         Returns:
             (手部关键点列表, 手势事件)
         """
-        results = self.hands.process(frame)
+        if not self.async_mode:
+            landmarks_list, gesture_event = self._process_sync(frame)
+            self._last_landmarks = landmarks_list
+            return landmarks_list, gesture_event
+        
+        if self._worker is None:
+            self._running = True
+            self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+            self._worker.start()
+        
+        # 提交最新帧（覆盖尚未处理的旧帧）
+        with self._input_lock:
+            self._pending_frame = frame
+            self._input_event.set()
+        
+        with self._result_lock:
+            gesture_event = self._pending_event
+            self._pending_event = None
+            return self._last_landmarks, gesture_event
+    
+    def _worker_loop(self):
+        """后台识别循环"""
+        while self._running:
+            if not self._input_event.wait(0.1):
+                continue
+            with self._input_lock:
+                frame = self._pending_frame
+                self._pending_frame = None
+                self._input_event.clear()
+            if frame is None:
+                continue
+            
+            try:
+                landmarks_list, gesture_event = self._process_sync(frame)
+            except Exception as e:
+                logger.error(f"手势识别出错: {e}")
+                continue
+            
+            with self._result_lock:
+                self._last_landmarks = landmarks_list
+                if gesture_event is not None:
+                    self._pending_event = gesture_event
+    
+    def _process_sync(self, frame: np.ndarray) -> Tuple[List[HandLandmarks], Optional[GestureEvent]]:
+        """同步执行检测与手势识别"""
+        # 每 infer_every 帧执行一次推理，其余帧由最近两次检测结果线性外推
+        self._frame_counter += 1
+        if (self.infer_every > 1 and self._detected
+                and self._frame_counter % self.infer_every != 0):
+            landmarks_list = self._extrapolate_landmarks()
+        else:
+            landmarks_list = self._detect_hands(frame)
         
-        landmarks_list = []
         gesture_event = None
         
-        if results.multi_hand_landmarks:
-            for hand_landmarks, handedness in zip(
-                results.multi_hand_landmarks, 
-                results.multi_handedness
-            ):
-                # 提取关键点
-                landmarks = self._extract_landmarks(hand_landmarks, handedness)
-                landmarks_list.append(landmarks)
-                
+        if landmarks_list:
+            for landmarks in landmarks_list:
                 # 识别手势
                 gesture = self._classify_gesture(landmarks)
                 
@@ -113,19 +226,65 @@ class MediaPipeAdapter:
             # 没有检测到手，重置状态机
             self.state_machine.update(None)
         
-        self._last_landmarks = landmarks_list
         return landmarks_list, gesture_event
     
-    def _extract_landmarks(self, hand_landmarks, handedness) -> HandLandmarks:
-        """提取手部关键点"""
-        landmarks = []
-        for lm in hand_landmarks.landmark:
-            landmarks.append((lm.x, lm.y, lm.z))
+    def _detect_hands(self, frame: np.ndarray) -> List[HandLandmarks]:
+        """运行 MediaPipe 推理并提取各手关键点"""
+        h, w = frame.shape[:2]
+        if cv2 is not None and 0 < self.inference_max_width < w:
+            small_w = self.inference_max_width
+            small_h = max(1, int(small_w * h / w))
+            frame = cv2.resize(frame, (small_w, small_h), interpolation=cv2.INTER_AREA)
+        
+        results = self.hands.process(frame)
+        
+        landmarks_list = []
+        if results.multi_hand_landmarks:
+            for hand_landmarks, handedness in zip(
+                results.multi_hand_landmarks, 
+                results.multi_handedness
+            ):
+                landmarks_list.append(self._extract_landmarks(hand_landmarks, handedness, (w, h)))
+        
+        self._prev_detected = self._detected
+        self._detected = landmarks_list
+        self._frames_since_detect = 0
+        return landmarks_list
+    
+    def _extrapolate_landmarks(self) -> List[HandLandmarks]:
+        """按最近两次检测结果线性外推关键点；同一只手无上一次结果时沿用最新结果"""
+        self._frames_since_detect += 1
+        alpha = self._frames_since_detect / self.infer_every
+        
+        landmarks_list = []
+        for i, curr in enumerate(self._detected):
+            arr = curr.landmarks
+            if i < len(self._prev_detected):
+                prev = self._prev_detected[i]
+                if prev.handedness == curr.handedness and prev.landmarks.shape == arr.shape:
+                    arr = arr + (arr - prev.landmarks) * alpha
+            landmarks_list.append(HandLandmarks(
+                landmarks=arr,
+                handedness=curr.handedness,
+                confidence=curr.confidence,
+                image_size=curr.image_size
+            ))
+        return landmarks_list
+    
+    def _extract_landmarks(self, hand_landmarks, handedness,
+                           image_size: Tuple[int, int] = (0, 0)) -> HandLandmarks:
+        """提取手部关键点，image_size 为采集分辨率 (宽, 高)"""
+        points = hand_landmarks.landmark
+        landmarks = np.fromiter(
+            (c for lm in points for c in (lm.x, lm.y, lm.z)),
+            dtype=np.float32, count=3 * len(points)
+        ).reshape(-1, 3)
         
         return HandLandmarks(
             landmarks=landmarks,
             handedness=handedness.classification[0].label,
-            confidence=handedness.classification[0].score
+            confidence=handedness.classification[0].score,
+            image_size=image_size
         )
     
     def _classify_gesture(self, landmarks: HandLandmarks) -> GestureType:
@@ -136,100 +295,60 @@ class MediaPipeAdapter:
         if len(landmarks.landmarks) < 21:
             return GestureType.UNKNOWN
         
-        # 获取各手指伸展状态
-        fingers_extended = [
-            landmarks.is_finger_extended(i) for i in range(5)
-        ]
-        thumb, index, middle, ring, pinky = fingers_extended
-        
-        # 计数伸展的手指
-        extended_count = sum(fingers_extended)
-        
-        # 识别手势
-        # 握拳：所有手指都收起
-        if extended_count == 0:
-            return GestureType.FIST
-        
-        # 五指张开
-        if extended_count == 5:
-            return GestureType.FIVE_FINGERS
-        
-        # 单指（食指）
-        if index and not middle and not ring and not pinky:
-            return GestureType.ONE_FINGER
+        # 五指伸展状态位掩码：拇指<<4 | 食指<<3 | 中指<<2 | 无名指<<1 | 小指
+        mask = landmarks.finger_mask
         
-        # 双指（剪刀手）
-        if index and middle and not ring and not pinky:
-            return GestureType.TWO_FINGERS
-        
-        # 三指
-        if index and middle and ring and not pinky:
-            return GestureType.THREE_FINGERS
-        
-        # 四指
-        if index and middle and ring and pinky and not thumb:
-            return GestureType.FOUR_FINGERS
+        # 握拳、五指张开、单指/双指/三指/四指
+        gesture = _FINGER_MASK_GESTURES.get(mask)
+        if gesture is not None:
+            return gesture
         
         # OK手势：拇指和食指接触
         if self._is_ok_gesture(landmarks):
             return GestureType.OK
         
-        # 点赞：只有拇指伸展
-        if thumb and not index and not middle and not ring and not pinky:
-            return GestureType.THUMBS_UP
+        # 点赞、摇滚手势（优先级低于OK手势）
+        gesture = _FINGER_MASK_GESTURES_AFTER_OK.get(mask)
+        if gesture is not None:
+            return gesture
         
         # 比心：检测单手比心手势
         if self._is_heart_gesture(landmarks):
             return GestureType.HEART
         
-        # 摇滚手势
-        if index and pinky and not middle and not ring:
-            return GestureType.ROCK
-        
         return GestureType.UNKNOWN
     
     def _is_ok_gesture(self, landmarks: HandLandmarks) -> bool:
         """检测OK手势（拇指和食指尖接近）"""
-        thumb_tip = landmarks.get_landmark(4)
-        index_tip = landmarks.get_landmark(8)
-        
-        if thumb_tip and index_tip:
-            distance = math.sqrt(
-                (thumb_tip[0] - index_tip[0])**2 +
-                (thumb_tip[1] - index_tip[1])**2
-            )
-            return distance < 0.05  # 归一化距离阈值
-        return False
+        return landmarks.distance_sq(4, 8) < _OK_TIP_DIST_SQ
     
     def _is_heart_gesture(self, landmarks: HandLandmarks) -> bool:
         """检测单手比心手势"""
-        # 拇指和食指尖接近形成心形顶部
-        thumb_tip = landmarks.get_landmark(4)
-        index_tip = landmarks.get_landmark(8)
-        
-        if thumb_tip and index_tip:
-            tip_distance = math.sqrt(
-                (thumb_tip[0] - index_tip[0])**2 +
-                (thumb_tip[1] - index_tip[1])**2
-            )
-            # 其他手指收起
-            fingers = [landmarks.is_finger_extended(i) for i in range(2, 5)]
-            if tip_distance < 0.08 and not any(fingers):
-                return True
-        return False
+        # 拇指和食指尖接近形成心形顶部，其他手指收起
+        if landmarks.distance_sq(4, 8) >= _HEART_TIP_DIST_SQ:
+            return False
+        return not landmarks.fingers_extended[2:5].any()
     
     def _update_position_history(self, landmarks: HandLandmarks):
         """更新位置历史（用于动态手势检测）"""
         palm_center = landmarks.get_palm_center()
         if palm_center:
             hand_key = landmarks.handedness
-            if hand_key not in self._last_positions:
-                self._last_positions[hand_key] = deque(maxlen=20)
+            hist = self._hist.get(hand_key)
+            if hist is None:
+                # 时间戳为 epoch 秒，float32 精度不足，因此使用 float64
+                hist = self._hist[hand_key] = np.zeros((_HISTORY_LEN, 3), dtype=np.float64)
+                self._head[hand_key] = 0
+                self._count[hand_key] = 0
             
-            self._last_positions[hand_key].append({
-                'position': palm_center,
-                'timestamp': time.time()
-            })
+            head = self._head[hand_key]
+            row = hist[head]
+            row[0] = palm_center[0]
+            row[1] = palm_center[1]
+            row[2] = time.time()
+            self._head[hand_key] = (head + 1) % _HISTORY_LEN
+            if self._count[hand_key] < _HISTORY_LEN:
+                self._count[hand_key] += 1
     
     def _detect_dynamic_gesture(self, landmarks: HandLandmarks) -> Optional[GestureType]:
         """
@@ -237,28 +356,25 @@ class MediaPipeAdapter:
         基于位置历史分析运动轨迹
         """
         hand_key = landmarks.handedness
-        if hand_key not in self._last_positions:
+        hist = self._hist.get(hand_key)
+        if hist is None:
             return None
         
-        history = self._last_positions[hand_key]
-        if len(history) < 5:
+        count = self._count[hand_key]
+        if count < 5:
             return None
         
-        # 获取最近的几个位置
-        recent_positions = list(history)[-10:]
-        
-        if len(recent_positions) < 5:
-            return None
+        # 取最近 _SWIPE_WINDOW 条记录的首尾两点
+        head = self._head[hand_key]
+        start = hist[(head - min(count, _SWIPE_WINDOW)) % _HISTORY_LEN]
+        end = hist[(head - 1) % _HISTORY_LEN]
         
         # 计算运动向量
-        start_pos = recent_positions[0]['position']
-        end_pos = recent_positions[-1]['position']
-        
-        dx = end_pos[0] - start_pos[0]
-        dy = end_pos[1] - start_pos[1]
+        dx = float(end[0] - start[0])
+        dy = float(end[1] - start[1])
         
         # 计算运动时间
-        time_elapsed = recent_positions[-1]['timestamp'] - recent_positions[0]['timestamp']
+        time_elapsed = float(end[2] - start[2])
         
         if time_elapsed < 0.1 or time_elapsed > 0.8:
             return None
@@ -301,26 +417,16 @@ class MediaPipeAdapter:
             return False
         
         # 检查两只手的食指和拇指是否接近
-        left_index = left_hand.get_landmark(8)
-        right_index = right_hand.get_landmark(8)
-        left_thumb = left_hand.get_landmark(4)
-        right_thumb = right_hand.get_landmark(4)
-        
-        if all([left_index, right_index, left_thumb, right_thumb]):
-            # 计算指尖距离
-            index_distance = math.sqrt(
-                (left_index[0] - right_index[0])**2 +
-                (left_index[1] - right_index[1])**2
-            )
-            thumb_distance = math.sqrt(
-                (left_thumb[0] - right_thumb[0])**2 +
-                (left_thumb[1] - right_thumb[1])**2
-            )
-            
-            # 双手形成心形的条件
-            return index_distance < 0.1 and thumb_distance < 0.15
+        if len(left_hand.landmarks) <= 8 or len(right_hand.landmarks) <= 8:
+            return False
         
-        return False
+        # 食指尖、拇指尖的双手距离平方，一次数组运算
+        d = left_hand.landmarks[[8, 4], :2] - right_hand.landmarks[[8, 4], :2]
+        index_dist_sq, thumb_dist_sq = (d * d).sum(axis=1).tolist()
+        
+        # 双手形成心形的条件
+        return (index_dist_sq < _DOUBLE_HEART_INDEX_DIST_SQ and
+                thumb_dist_sq < _DOUBLE_HEART_THUMB_DIST_SQ)
     
     def draw_landmarks(self, frame: np.ndarray, 
                        landmarks_list: List[HandLandmarks]) -> np.ndarray:
@@ -328,35 +434,23 @@ class MediaPipeAdapter:
         if mp is None:
             return frame
         
-        # 需要将HandLandmarks转换回MediaPipe格式进行绘制
-        # 这里我们手动绘制
+        # 手动绘制：骨骼连线一次 polylines 调用完成
+        h, w = frame.shape[:2]
+        scale = np.array([w, h], dtype=np.float32)
         for landmarks in landmarks_list:
-            points = [(int(lm[0] * frame.shape[1]), int(lm[1] * frame.shape[0])) 
-                      for lm in landmarks.landmarks]
+            # 产生方已按采集分辨率换算过像素坐标时直接复用
+            if landmarks.image_size == (w, h):
+                points = landmarks.pixel_xy.astype(np.int32)
+            else:
+                points = (landmarks.landmarks[:, :2] * scale).astype(np.int32)
             
             # 绘制关键点
-            for point in points:
-                cv2.circle(frame, point, 4, (0, 255, 0), -1)
-            
-            # 绘制连接线
-            connections = [
-                # 拇指
-                (0, 1), (1, 2), (2, 3), (3, 4),
-                # 食指
-                (0, 5), (5, 6), (6, 7), (7, 8),
-                # 中指
-                (9, 10), (10, 11), (11, 12),
-                # 无名指
-                (13, 14), (14, 15), (15, 16),
-                # 小指
-                (0, 17), (17, 18), (18, 19), (19, 20),
-                # 手掌
-                (5, 9), (9, 13), (13, 17)
-            ]
+            for x, y in points.tolist():
+                cv2.circle(frame, (x, y), 4, (0, 255, 0), -1)
             
-            for start, end in connections:
-                if start < len(points) and end < len(points):
-                    cv2.line(frame, points[start], points[end], (0, 255, 255), 2)
+            # 绘制连接线：(N, 2, 2) 的线段数组，每段作为一条不闭合折线
+            segments = points[_HAND_CONNECTIONS]
+            cv2.polylines(frame, segments, False, (0, 255, 255), 2)
         
         return frame
     
@@ -389,6 +483,11 @@ class MediaPipeAdapter:
     
     def release(self):
         """释放资源"""
+        self._running = False
+        self._input_event.set()
+        if self._worker and self._worker.is_alive():
+            self._worker.join(timeout=1)
+        self._worker = None
         self.hands.close()
         logger.info("MediaPipe 适配器已释放")
 
@@ -3,16 +3,29 @@ System Adapter - 系统控制适配器
 负责键盘、鼠标模拟和系统命令执行
 """
 
+import atexit
+import concurrent.futures
+import ctypes
 import logging
+import os
+import queue
+import shutil
 import subprocess
+import threading
 import time
-from typing import Optional, Tuple
+import types
+import uuid
+from contextlib import contextmanager
+from ctypes import wintypes
+from typing import Optional, Tuple, Dict, List
 from enum import Enum
 
+import numpy as np
+
 try:
     import pyautogui
     pyautogui.FAILSAFE = False  # 禁用安全模式
-    pyautogui.PAUSE = 0.01     # 减少操作间隔
+    pyautogui.PAUSE = 0.0      # 不在每次调用后休眠，确需间隔的操作用 _pause 局部设置
 except ImportError:
     pyautogui = None
     logging.warning("pyautogui 未安装")
@@ -25,33 +38,378 @@ except ImportError:
     HAS_WIN32 = False
     logging.warning("win32api 未安装，部分功能可能不可用")
 
+try:
+    import pythoncom
+    import wmi
+    HAS_WMI = True
+except ImportError:
+    HAS_WMI = False
+
+try:
+    import comtypes
+    from comtypes import CLSCTX_ALL
+    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+    HAS_PYCAW = True
+except ImportError:
+    HAS_PYCAW = False
+
 from ..domain.action import Action, ActionType, ActionResult, MouseAction, SystemAction
 
 logger = logging.getLogger(__name__)
 
+# 音量/亮度调整的合并窗口（秒）：窗口内的连续调整累加后一次执行
+_COALESCE_WINDOW = 0.02
+
+
+@contextmanager
+def _pause(seconds: float):
+    """临时设置 pyautogui 每次调用后的停顿时间，退出时恢复"""
+    previous = pyautogui.PAUSE
+    pyautogui.PAUSE = seconds
+    try:
+        yield
+    finally:
+        pyautogui.PAUSE = previous
+
+
+# ===== SendInput（Windows）：一次系统调用提交一批输入事件 =====
+
+try:
+    _user32 = ctypes.windll.user32
+    HAS_SENDINPUT = True
+except AttributeError:
+    _user32 = None
+    HAS_SENDINPUT = False
+
+_INPUT_MOUSE = 0
+_INPUT_KEYBOARD = 1
+_MOUSEEVENTF_MOVE = 0x0001
+_MOUSEEVENTF_ABSOLUTE = 0x8000
+_KEYEVENTF_EXTENDEDKEY = 0x0001
+_KEYEVENTF_KEYUP = 0x0002
+_VK_VOLUME_DOWN = 0xAE
+_VK_VOLUME_UP = 0xAF
+
+# 鼠标按键 -> (按下, 松开) 事件标志
+_MOUSE_BUTTON_FLAGS = {
+    'left': (0x0002, 0x0004),
+    'right': (0x0008, 0x0010),
+    'middle': (0x0020, 0x0040),
+}
+
+# 按键名 -> 虚拟键码（导入时构建一次）
+_VK_CODES = {
+    'space': 0x20, 'enter': 0x0D, 'return': 0x0D, 'tab': 0x09,
+    'escape': 0x1B, 'esc': 0x1B, 'backspace': 0x08, 'delete': 0x2E, 'del': 0x2E,
+    'insert': 0x2D, 'up': 0x26, 'down': 0x28, 'left': 0x25, 'right': 0x27,
+    'home': 0x24, 'end': 0x23, 'pageup': 0x21, 'pagedown': 0x22,
+    'ctrl': 0x11, 'control': 0x11, 'shift': 0x10, 'alt': 0x12, 'win': 0x5B,
+    'volumemute': 0xAD, 'volumedown': _VK_VOLUME_DOWN, 'volumeup': _VK_VOLUME_UP,
+    'nexttrack': 0xB0, 'prevtrack': 0xB1, 'playpause': 0xB3,
+}
+_VK_CODES.update({f'f{i}': 0x70 + i - 1 for i in range(1, 13)})
+_VK_CODES.update({chr(c): ord(chr(c).upper()) for c in range(ord('a'), ord('z') + 1)})
+_VK_CODES.update({str(d): 0x30 + d for d in range(10)})
+
+# 需要扩展键标志的虚拟键（方向键、编辑键区等），否则部分程序会识别为小键盘按键
+_EXTENDED_VKS = frozenset({0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x27, 0x28,
+                           0x2D, 0x2E, 0x5B})
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [('dx', wintypes.LONG), ('dy', wintypes.LONG),
+                ('mouseData', wintypes.DWORD), ('dwFlags', wintypes.DWORD),
+                ('time', wintypes.DWORD), ('dwExtraInfo', ctypes.c_size_t)]
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [('wVk', wintypes.WORD), ('wScan', wintypes.WORD),
+                ('dwFlags', wintypes.DWORD), ('time', wintypes.DWORD),
+                ('dwExtraInfo', ctypes.c_size_t)]
+
+
+class _HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [('uMsg', wintypes.DWORD), ('wParamL', wintypes.WORD),
+                ('wParamH', wintypes.WORD)]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [('mi', _MOUSEINPUT), ('ki', _KEYBDINPUT), ('hi', _HARDWAREINPUT)]
+
+
+class _INPUT(ctypes.Structure):
+    _anonymous_ = ('u',)
+    _fields_ = [('type', wintypes.DWORD), ('u', _INPUTUNION)]
+
+
+def _send_inputs(inputs):
+    """提交一批 INPUT 记录"""
+    sent = _user32.SendInput(len(inputs), inputs, ctypes.sizeof(_INPUT))
+    if sent != len(inputs):
+        raise ctypes.WinError()
+
+
+def _key_event(record: _INPUT, vk: int, key_up: bool):
+    """填充一条键盘事件"""
+    record.type = _INPUT_KEYBOARD
+    record.ki.wVk = vk
+    flags = _KEYEVENTF_KEYUP if key_up else 0
+    if vk in _EXTENDED_VKS:
+        flags |= _KEYEVENTF_EXTENDEDKEY
+    record.ki.dwFlags = flags
+
+
+def _send_key_taps(vk: int, count: int):
+    """连续按下并松开同一虚拟键 count 次，全部事件一次提交"""
+    inputs = (_INPUT * (2 * count))()
+    for i in range(2 * count):
+        _key_event(inputs[i], vk, bool(i % 2))
+    _send_inputs(inputs)
+
+
+def _fast_keys(vks):
+    """依次按下所有键再逆序松开（组合键），一次提交"""
+    n = len(vks)
+    inputs = (_INPUT * (2 * n))()
+    for i, vk in enumerate(vks):
+        _key_event(inputs[i], vk, False)
+        _key_event(inputs[2 * n - 1 - i], vk, True)
+    _send_inputs(inputs)
+
+
+def _fast_click(button: str, clicks: int = 1,
+                abs_pos: Optional[Tuple[int, int]] = None):
+    """
+    点击鼠标按键 clicks 次，一次提交
+    
+    abs_pos 为 0-65535 绝对坐标时，先在同一批事件中移动光标
+    """
+    down, up = _MOUSE_BUTTON_FLAGS[button]
+    offset = 0 if abs_pos is None else 1
+    inputs = (_INPUT * (2 * clicks + offset))()
+    if abs_pos is not None:
+        inputs[0].type = _INPUT_MOUSE
+        inputs[0].mi.dx, inputs[0].mi.dy = abs_pos
+        inputs[0].mi.dwFlags = _MOUSEEVENTF_MOVE | _MOUSEEVENTF_ABSOLUTE
+    for i in range(2 * clicks):
+        record = inputs[offset + i]
+        record.type = _INPUT_MOUSE
+        record.mi.dwFlags = up if i % 2 else down
+    _send_inputs(inputs)
+
+
+class _PersistentHost:
+    """
+    常驻解释器进程
+    
+    命令经 stdin 逐行发送，每条命令后追加一条输出 "唯一结束标记 退出码" 的语句，
+    读取端读到该标记即认为命令执行完毕。进程在首次使用或退出后按需启动。
+    """
+    
+    def __init__(self, name: str, argv: List[str], echo_fmt: str,
+                 init_lines: Tuple[str, ...] = ()):
+        self.name = name
+        self._argv = argv
+        self._echo_fmt = echo_fmt        # 输出结束标记与退出码的语句模板，{0} 为标记
+        self._init_lines = init_lines    # 进程启动后执行一次的语句
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: Optional[queue.Queue] = None
+        self._lock = threading.Lock()
+    
+    def _start(self):
+        """启动进程，输出由后台线程逐行转入队列，以便带超时读取"""
+        self._proc = subprocess.Popen(
+            self._argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, text=True, bufsize=1
+        )
+        self._lines = queue.Queue()
+        threading.Thread(
+            target=self._pump, args=(self._proc.stdout, self._lines),
+            name=f'host-{self.name}', daemon=True
+        ).start()
+        for line in self._init_lines:
+            self._proc.stdin.write(line + '\n')
+        logger.debug(f"常驻进程已启动: {self.name}")
+    
+    @staticmethod
+    def _pump(stream, lines: queue.Queue):
+        for line in stream:
+            lines.put(line)
+        lines.put(None)  # 进程已退出
+    
+    def run(self, command: str, timeout: Optional[float] = None) -> Tuple[List[str], int]:
+        """
+        执行一条命令，返回 (输出行, 退出码)，超时则结束进程并抛出 TimeoutExpired
+        命令使进程退出（如批处理中不带 /b 的 exit）时以进程退出码作为结果，下次使用时重启
+        """
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._start()
+            
+            # 标记只含字母数字和下划线，在各解释器中都无需转义
+            sentinel = f'__END_{uuid.uuid4().hex}__'
+            try:
+                self._proc.stdin.write(f'{command}\n{self._echo_fmt.format(sentinel)}\n')
+                self._proc.stdin.flush()
+            except OSError as e:
+                self._proc = None
+                raise RuntimeError(f"{self.name} 常驻进程不可写: {e}")
+            
+            deadline = None if timeout is None else time.monotonic() + timeout
+            output = []
+            while True:
+                try:
+                    if deadline is None:
+                        line = self._lines.get()
+                    else:
+                        line = self._lines.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    self._kill()
+                    raise subprocess.TimeoutExpired(self._argv, timeout)
+                
+                if line is None:
+                    proc, self._proc = self._proc, None
+                    try:
+                        status = proc.wait(timeout=1)
+                    except subprocess.TimeoutExpired:
+                        proc.kill()
+                        status = -1
+                    logger.debug(f"{self.name} 常驻进程已退出，退出码 {status}")
+                    return output, status
+                stripped = line.strip()
+                if stripped.startswith(sentinel):
+                    status = stripped[len(sentinel):].strip()
+                    return output, int(status) if status.lstrip('-').isdigit() else 0
+                output.append(line)
+    
+    def _kill(self):
+        proc, self._proc = self._proc, None
+        if proc is not None:
+            proc.kill()
+    
+    def close(self):
+        """关闭 stdin 让进程自然退出，超时则强制结束"""
+        with self._lock:
+            proc, self._proc = self._proc, None
+        if proc is None or proc.poll() is not None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=2)
+        except Exception:
+            proc.kill()
+
 
 class SystemAdapter:
     """系统控制适配器 - 执行键鼠和系统命令"""
     
+    # pyautogui 按键名映射（只读，避免每次按键重建字典）
+    _KEY_MAP = types.MappingProxyType({
+        'space': 'space',
+        'enter': 'enter',
+        'tab': 'tab',
+        'escape': 'escape',
+        'esc': 'escape',
+        'backspace': 'backspace',
+        'delete': 'delete',
+        'up': 'up',
+        'down': 'down',
+        'left': 'left',
+        'right': 'right',
+        'home': 'home',
+        'end': 'end',
+        'pageup': 'pageup',
+        'pagedown': 'pagedown',
+        'f1': 'f1', 'f2': 'f2', 'f3': 'f3', 'f4': 'f4',
+        'f5': 'f5', 'f6': 'f6', 'f7': 'f7', 'f8': 'f8',
+        'f9': 'f9', 'f10': 'f10', 'f11': 'f11', 'f12': 'f12',
+    })
+    
+    # 鼠标点击动作 -> (按键, 点击次数)，用于 SendInput 快速路径
+    _FAST_CLICKS = {
+        'left_click': ('left', 1),
+        'right_click': ('right', 1),
+        'double_click': ('left', 2),
+        'middle_click': ('middle', 1),
+    }
+    
     def __init__(self):
         if pyautogui is None:
             raise RuntimeError("pyautogui 未安装")
         
         self.screen_width, self.screen_height = pyautogui.size()
+        
+        # 坐标换算系数预先计算，换算时只做乘法
+        self._nx = float(self.screen_width)
+        self._ny = float(self.screen_height)
+        self._inv_nx = 1.0 / self.screen_width
+        self._inv_ny = 1.0 / self.screen_height
+        self._screen_scale = np.array([self._nx, self._ny], dtype=np.float32)
+        # 屏幕像素 -> SendInput 绝对坐标（0-65535）
+        self._abs_sx = 65535.0 / max(1, self.screen_width - 1)
+        self._abs_sy = 65535.0 / max(1, self.screen_height - 1)
+        
+        # PowerShell 可执行文件只解析一次：优先 PowerShell 7（冷启动更快）
+        self._pwsh = shutil.which('pwsh') or 'powershell'
+        
+        # 常驻解释器进程（首次使用时启动）：亮度调整专用一个 PowerShell，脚本按类型各一个
+        self._brightness_host = _PersistentHost(
+            'brightness',
+            [self._pwsh, '-NoProfile', '-NonInteractive', '-Command', '-'],
+            'Write-Output "{0} $LASTEXITCODE"',
+            # 亮度方法对象只获取一次
+            init_lines=('$bm = Get-CimInstance -Namespace root/wmi -ClassName WmiMonitorBrightnessMethods',)
+        )
+        self._hosts: Dict[str, _PersistentHost] = {
+            'powershell': _PersistentHost(
+                'powershell',
+                [self._pwsh, '-NoProfile', '-NonInteractive',
+                 '-ExecutionPolicy', 'Bypass', '-Command', '-'],
+                'Write-Output "{0} $LASTEXITCODE"'
+            ),
+            # %errorlevel% 在读入该行时展开，此时上一行的脚本已执行完
+            'cmd': _PersistentHost('cmd', ['cmd', '/d', '/q'], 'echo {0} %errorlevel%'),
+        }
+        
+        # 脚本在线程池中执行，不阻塞动作分发线程
+        self._script_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix='sysadapter-script'
+        )
+        self._script_futures: set = set()
+        self._script_futures_lock = threading.Lock()
+        
+        # 连发的音量/亮度调整：目标 -> 累计增量 / 执行截止时间（time.monotonic）
+        # 由单个常驻线程按截止时间执行，线程绑定的 WMI/COM 缓存得以跨次复用
+        self._coalesce_state: Dict[str, int] = {}
+        self._coalesce_deadlines: Dict[str, float] = {}
+        self._coalesce_cond = threading.Condition()
+        # 当前执行线程；线程决定退出时在持锁状态下自行置 None，之后的调整会启动新线程
+        self._coalesce_worker: Optional[threading.Thread] = None
+        self._coalesce_running = False
+        atexit.register(self.release)
+        
+        # WMI 连接与 COM 初始化均绑定线程，按线程各自缓存
+        self._wmi_local = threading.local()
+        # Core Audio 端点接口同样绑定线程
+        self._audio_local = threading.local()
         logger.info(f"系统适配器已初始化，屏幕尺寸: {self.screen_width}x{self.screen_height}")
     
-    def execute(self, action: Action, position: Optional[Tuple[int, int]] = None) -> ActionResult:
+    def execute(self, action: Action, position: Optional[Tuple[int, int]] = None,
+                measure: bool = False) -> ActionResult:
         """
         执行动作
         
         Args:
             action: 动作对象
             position: 可选的位置坐标（用于鼠标操作）
+            measure: 是否统计执行耗时（DEBUG 日志开启时总是统计）
         
         Returns:
             ActionResult: 执行结果
         """
-        start_time = time.time()
+        # 只在需要时计时，避免生产环境每次动作的时钟读取与日志格式化
+        timed = measure or logger.isEnabledFor(logging.DEBUG)
+        start_time = time.perf_counter() if timed else 0.0
+        message = "执行成功"
         
         try:
             if action.action_type == ActionType.KEYBOARD:
@@ -62,13 +420,16 @@ class SystemAdapter:
                 self._execute_system(action)
             elif action.action_type == ActionType.SCRIPT:
                 self._execute_script(action)
+                message = "脚本已提交"
             elif action.action_type == ActionType.EFFECT:
                 # 特效不在这里处理，返回成功让上层处理
                 pass
             
-            exec_time = (time.time() - start_time) * 1000
-            logger.debug(f"动作执行成功: {action.display_name} ({exec_time:.1f}ms)")
-            return ActionResult.success_result(action, exec_time=exec_time)
+            exec_time = 0.0
+            if timed:
+                exec_time = (time.perf_counter() - start_time) * 1000
+                logger.debug(f"动作执行成功: {action.display_name} ({exec_time:.1f}ms)")
+            return ActionResult.success_result(action, message=message, exec_time=exec_time)
             
         except Exception as e:
             logger.error(f"动作执行失败: {action.display_name} - {e}")
@@ -78,6 +439,13 @@ class SystemAdapter:
         """执行键盘动作"""
         key = action.action_value.lower()
         
+        # 快速路径：所有键都有虚拟键码时直接 SendInput，绕过 pyautogui
+        if HAS_SENDINPUT:
+            vks = [_VK_CODES.get(k.strip()) for k in key.split('+')]
+            if all(vk is not None for vk in vks):
+                _fast_keys(vks)
+                return
+        
         # 处理组合键
         if '+' in key:
             keys = key.split('+')
@@ -85,37 +453,27 @@ class SystemAdapter:
             pyautogui.hotkey(*keys)
         else:
             # 处理特殊键映射
-            key_map = {
-                'space': 'space',
-                'enter': 'enter',
-                'tab': 'tab',
-                'escape': 'escape',
-                'esc': 'escape',
-                'backspace': 'backspace',
-                'delete': 'delete',
-                'up': 'up',
-                'down': 'down',
-                'left': 'left',
-                'right': 'right',
-                'home': 'home',
-                'end': 'end',
-                'pageup': 'pageup',
-                'pagedown': 'pagedown',
-                'f1': 'f1', 'f2': 'f2', 'f3': 'f3', 'f4': 'f4',
-                'f5': 'f5', 'f6': 'f6', 'f7': 'f7', 'f8': 'f8',
-                'f9': 'f9', 'f10': 'f10', 'f11': 'f11', 'f12': 'f12',
-            }
-            
-            mapped_key = key_map.get(key, key)
+            mapped_key = self._KEY_MAP.get(key, key)
             pyautogui.press(mapped_key)
     
     def _execute_mouse(self, action: Action, position: Optional[Tuple[int, int]] = None):
         """执行鼠标动作"""
         mouse_action = action.action_value.lower()
         
-        # 移动到指定位置
+        # 快速路径：移动与点击编码为同一批 SendInput 事件
+        if HAS_SENDINPUT and mouse_action in self._FAST_CLICKS:
+            abs_pos = None
+            if position:
+                abs_pos = (int(round(position[0] * self._abs_sx)),
+                           int(round(position[1] * self._abs_sy)))
+            button, clicks = self._FAST_CLICKS[mouse_action]
+            _fast_click(button, clicks, abs_pos)
+            return
+        
+        # 移动到指定位置，留出短暂间隔让部分旧程序在点击前更新悬停状态
         if position and mouse_action != 'move':
-            pyautogui.moveTo(position[0], position[1], duration=0)
+            with _pause(0.01):
+                pyautogui.moveTo(position[0], position[1], duration=0)
         
         if mouse_action == 'left_click':
             pyautogui.click()
@@ -140,17 +498,19 @@ class SystemAdapter:
         system_action = action.action_value.lower()
         
         if system_action == 'volume_up':
-            self._adjust_volume(2)
+            self._coalesce('volume', 2)
         elif system_action == 'volume_down':
-            self._adjust_volume(-2)
+            self._coalesce('volume', -2)
         elif system_action == 'volume_mute':
-            pyautogui.press('volumemute')
+            # 交给合并线程执行：Core Audio 的 COM 初始化随该线程退出一起反初始化；
+            # 窗口内成对的切换互相抵消
+            self._coalesce('mute', 1)
         elif system_action == 'media_play_pause':
-            pyautogui.press('playpause')
+            self._press_media_key('playpause')
         elif system_action == 'media_next':
-            pyautogui.press('nexttrack')
+            self._press_media_key('nexttrack')
         elif system_action == 'media_prev':
-            pyautogui.press('prevtrack')
+            self._press_media_key('prevtrack')
         elif system_action == 'lock_screen':
             self._lock_screen()
         elif system_action == 'screenshot':
@@ -158,39 +518,140 @@ class SystemAdapter:
         elif system_action == 'task_manager':
             pyautogui.hotkey('ctrl', 'shift', 'escape')
         elif system_action == 'brightness_up':
-            self._adjust_brightness(10)
+            self._coalesce('brightness', 10)
         elif system_action == 'brightness_down':
-            self._adjust_brightness(-10)
+            self._coalesce('brightness', -10)
+    
+    def _toggle_mute(self):
+        """切换静音：优先直接调用 Core Audio 接口，否则发送静音键（在合并线程中调用）"""
+        if HAS_PYCAW:
+            local = self._audio_local
+            if getattr(local, 'volume', None) is None:
+                comtypes.CoInitialize()
+                speakers = AudioUtilities.GetSpeakers()
+                # 新版 pycaw 返回 AudioDevice 包装，端点接口已就绪；旧版返回 IMMDevice，需要自行激活
+                endpoint = getattr(speakers, 'EndpointVolume', None)
+                if endpoint is None:
+                    interface = speakers.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+                    endpoint = ctypes.cast(interface, ctypes.POINTER(IAudioEndpointVolume))
+                local.volume = endpoint
+            local.volume.SetMute(not local.volume.GetMute(), None)
+            return
+        
+        self._press_media_key('volumemute')
+    
+    def _press_media_key(self, key: str):
+        """发送媒体键，Windows 下直接 SendInput"""
+        if HAS_SENDINPUT:
+            _send_key_taps(_VK_CODES[key], 1)
+        else:
+            pyautogui.press(key)
+    
+    def _coalesce(self, target: str, delta: int):
+        """
+        累加音量/亮度调整量（静音按切换次数累计），窗口结束时一次执行
+        
+        截止时间只在窗口内第一次调整时设定，持续连发也不会无限推迟执行
+        """
+        with self._coalesce_cond:
+            self._coalesce_state[target] = self._coalesce_state.get(target, 0) + delta
+            if target in self._coalesce_deadlines:
+                return
+            self._coalesce_deadlines[target] = time.monotonic() + _COALESCE_WINDOW
+            if self._coalesce_worker is None:
+                self._coalesce_running = True
+                self._coalesce_worker = threading.Thread(
+                    target=self._coalesce_loop, name='sysadapter-coalesce', daemon=True
+                )
+                self._coalesce_worker.start()
+            self._coalesce_cond.notify()
+    
+    def _coalesce_loop(self):
+        """合并调整的执行线程：等到最早的截止时间后执行对应目标；停止时先执行完剩余调整"""
+        me = threading.current_thread()
+        try:
+            while True:
+                with self._coalesce_cond:
+                    while True:
+                        if self._coalesce_deadlines:
+                            target = min(self._coalesce_deadlines, key=self._coalesce_deadlines.get)
+                            remaining = self._coalesce_deadlines[target] - time.monotonic()
+                            if remaining <= 0:
+                                break
+                            self._coalesce_cond.wait(remaining)
+                        elif not self._coalesce_running:
+                            # 与 _coalesce 的判断在同一把锁下，此后提交的调整由新线程处理
+                            self._coalesce_worker = None
+                            return
+                        else:
+                            self._coalesce_cond.wait()
+                    del self._coalesce_deadlines[target]
+                    delta = self._coalesce_state.pop(target, 0)
+                self._flush_coalesced(target, delta)
+        finally:
+            # 异常退出时同样让出位置，避免之后的调整无人执行
+            with self._coalesce_cond:
+                if self._coalesce_worker is me:
+                    self._coalesce_worker = None
+            self._release_thread_com()
+    
+    def _flush_coalesced(self, target: str, delta: int):
+        """执行窗口内累计的调整量"""
+        if delta == 0:
+            return
+        
+        try:
+            if target == 'volume':
+                self._adjust_volume(delta)
+            elif target == 'mute':
+                if delta % 2:
+                    self._toggle_mute()
+            else:
+                self._adjust_brightness(delta)
+        except Exception as e:
+            logger.warning(f"执行合并的{target}调整失败: {e}")
     
     def _execute_script(self, action: Action):
-        """执行自定义脚本"""
+        """提交自定义脚本到线程池，立即返回"""
+        future = self._script_pool.submit(self._run_script_blocking, action)
+        with self._script_futures_lock:
+            self._script_futures.add(future)
+        future.add_done_callback(self._on_script_done)
+    
+    def _on_script_done(self, future: concurrent.futures.Future):
+        """脚本结束回调（错误已在工作线程中记录）"""
+        with self._script_futures_lock:
+            self._script_futures.discard(future)
+    
+    def _run_script_blocking(self, action: Action):
+        """在工作线程中执行自定义脚本"""
         script_path = action.action_value
         script_type = action.parameters.get('type', 'powershell')
         timeout = action.parameters.get('timeout', 30)
         
         try:
-            if script_type == 'powershell':
-                result = subprocess.run(
-                    ['powershell', '-ExecutionPolicy', 'Bypass', '-File', script_path],
-                    capture_output=True, text=True, timeout=timeout
-                )
-            elif script_type == 'cmd':
-                result = subprocess.run(
-                    ['cmd', '/c', script_path],
-                    capture_output=True, text=True, timeout=timeout
-                )
-            elif script_type == 'python':
+            host = self._hosts.get(script_type)
+            if host is not None:
+                # 在常驻进程中执行，省去每次启动解释器的开销
+                output, status = host.run(self._script_command(script_type, script_path), timeout=timeout)
+                if status != 0:
+                    logger.warning(f"脚本执行返回非0 ({status}): {''.join(output).strip()}")
+                elif output:
+                    logger.debug(f"脚本输出: {''.join(output).strip()}")
+                return
+            
+            if script_type == 'python':
+                # Python 脚本每次独立进程执行：共享解释器会让 sys.modules、工作目录、sys.path 在脚本间残留
                 result = subprocess.run(
-                    ['python', script_path],
+                    ['python', script_path], stdin=subprocess.DEVNULL,
                     capture_output=True, text=True, timeout=timeout
                 )
             else:
                 # 直接执行
                 result = subprocess.run(
-                    script_path, shell=True,
+                    script_path, shell=True, stdin=subprocess.DEVNULL,
                     capture_output=True, text=True, timeout=timeout
                 )
-            
             if result.returncode != 0:
                 logger.warning(f"脚本执行返回非0: {result.stderr}")
                 
@@ -201,27 +662,95 @@ class SystemAdapter:
             logger.error(f"脚本执行错误: {e}")
             raise
     
+    @staticmethod
+    def _script_command(script_type: str, script_path: str) -> str:
+        """
+        生成在常驻进程中运行脚本文件的单行命令
+        
+        先把退出码清零，避免沿用上一条命令的结果；脚本的标准输入与命令管道隔开，
+        读取输入的脚本（set /p、$input）读到空输入而不会吞掉后续命令和结束标记
+        （-NonInteractive 下 Read-Host 直接报错）
+        """
+        if script_type == 'powershell':
+            # 用 & 在子作用域运行，避免脚本变量残留在共享会话中；未捕获的异常记为退出码 1
+            quoted = script_path.replace("'", "''")
+            return (f"$global:LASTEXITCODE = 0; "
+                    f"try {{ $null | & '{quoted}' }} "
+                    f"catch {{ Write-Output $_; $global:LASTEXITCODE = 1 }}")
+        # ver 执行成功会把 errorlevel 置 0
+        return f'ver >nul & call "{script_path}" <nul'
+
+    
     def _adjust_volume(self, delta: int):
         """调整音量"""
+        # 所有按键事件一次提交，无需逐次等待（系统音量会自行合并）
+        if HAS_SENDINPUT:
+            _send_key_taps(_VK_VOLUME_UP if delta > 0 else _VK_VOLUME_DOWN, abs(delta))
+            return
+        
         key = 'volumeup' if delta > 0 else 'volumedown'
-        for _ in range(abs(delta)):
-            pyautogui.press(key)
-            time.sleep(0.05)
+        pyautogui.press(key, presses=abs(delta), interval=0)
     
     def _adjust_brightness(self, delta: int):
         """调整屏幕亮度（Windows）"""
         try:
-            # 使用PowerShell调整亮度
-            if delta > 0:
-                cmd = f'(Get-WmiObject -Namespace root/wmi -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, [Math]::Min(100, (Get-WmiObject -Namespace root/wmi -Class WmiMonitorBrightness).CurrentBrightness + {delta}))'
-            else:
-                cmd = f'(Get-WmiObject -Namespace root/wmi -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, [Math]::Max(0, (Get-WmiObject -Namespace root/wmi -Class WmiMonitorBrightness).CurrentBrightness + {delta}))'
+            if HAS_WMI:
+                self._set_brightness_wmi(delta)
+                return
             
-            subprocess.run(['powershell', '-Command', cmd], 
-                          capture_output=True, timeout=5)
+            # 无 WMI 模块时回退到常驻 PowerShell 会话
+            # 当前亮度每次重新读取（可能被用户在系统中修改），WMI 方法对象在会话中缓存
+            cmd = (
+                f'$b = [Math]::Max(0, [Math]::Min(100, (Get-CimInstance -Namespace root/wmi -ClassName WmiMonitorBrightness).CurrentBrightness + {int(delta)})); '
+                f'Invoke-CimMethod -InputObject $bm -MethodName WmiSetBrightness -Arguments @{{Timeout = 1; Brightness = [byte]$b}} | Out-Null'
+            )
+            self._brightness_host.run(f"try {{ {cmd} }} catch {{ }}", timeout=5)
         except Exception as e:
             logger.warning(f"调整亮度失败: {e}")
     
+    def _set_brightness_wmi(self, delta: int):
+        """在当前进程内直接通过 WMI 调整亮度"""
+        local = self._wmi_local
+        if getattr(local, 'conn', None) is None:
+            pythoncom.CoInitialize()
+            local.conn = wmi.WMI(namespace='root/wmi')
+            local.methods = local.conn.WmiMonitorBrightnessMethods()[0]
+        
+        current = local.conn.WmiMonitorBrightness()[0].CurrentBrightness
+        local.methods.WmiSetBrightness(Brightness=max(0, min(100, current + delta)), Timeout=1)
+    
+    def _release_thread_com(self):
+        """释放当前线程缓存的 WMI 连接与音频端点，并反初始化对应的 COM（线程退出前调用）"""
+        local = self._wmi_local
+        if getattr(local, 'conn', None) is not None:
+            local.conn = None
+            local.methods = None
+            pythoncom.CoUninitialize()
+        
+        local = self._audio_local
+        if getattr(local, 'volume', None) is not None:
+            local.volume = None
+            comtypes.CoUninitialize()
+    
+    def release(self):
+        """释放资源：等待执行中的脚本结束，关闭所有常驻解释器进程"""
+        # 尚在合并窗口中的调整立即到期，由执行线程执行完后退出
+        with self._coalesce_cond:
+            self._coalesce_running = False
+            for target in self._coalesce_deadlines:
+                self._coalesce_deadlines[target] = 0.0
+            self._coalesce_cond.notify()
+            worker = self._coalesce_worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout=5)
+        
+        # 尚未开始的脚本直接取消
+        self._script_pool.shutdown(wait=True, cancel_futures=True)
+        
+        self._brightness_host.close()
+        for host in self._hosts.values():
+            host.close()
+    
     def _lock_screen(self):
         """锁定屏幕"""
         pyautogui.hotkey('win', 'l')
@@ -243,20 +772,24 @@ class SystemAdapter:
     
     def normalized_to_screen(self, x: float, y: float) -> Tuple[int, int]:
         """归一化坐标转屏幕坐标"""
-        screen_x = int(x * self.screen_width)
-        screen_y = int(y * self.screen_height)
-        return (screen_x, screen_y)
+        return (int(x * self._nx), int(y * self._ny))
+    
+    def normalized_to_screen_batch(self, points: np.ndarray) -> np.ndarray:
+        """批量转换：(N, 2) 归一化坐标 -> (N, 2) int32 屏幕坐标"""
+        return (np.asarray(points)[:, :2] * self._screen_scale).astype(np.int32)
     
     def screen_to_normalized(self, x: int, y: int) -> Tuple[float, float]:
         """屏幕坐标转归一化坐标"""
-        norm_x = x / self.screen_width
-        norm_y = y / self.screen_height
-        return (norm_x, norm_y)
+        return (x * self._inv_nx, y * self._inv_ny)
     
     def open_application(self, path: str) -> bool:
         """打开应用程序"""
         try:
-            subprocess.Popen(path, shell=True)
+            if hasattr(os, 'startfile'):
+                # Windows：直接调用 ShellExecute，不经过 cmd.exe
+                os.startfile(path)
+            else:
+                subprocess.Popen([path])
             return True
         except Exception as e:
             logger.error(f"打开应用失败: {e}")
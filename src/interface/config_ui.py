@@ -9,7 +9,7 @@ from PyQt5.QtWidgets import (
     QGroupBox, QFormLayout, QSpinBox, QDoubleSpinBox,
     QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont
 
 from typing import Dict, Any
@@ -18,7 +18,10 @@ from typing import Dict, Any
 class ConfigDialog(QDialog):
     """配置对话框"""
     
+    # 保存时只发出发生变化的顶层配置项
     config_changed = pyqtSignal(dict)
+    # 拖动滑块时的实时预览（节流，最多每 50ms 一次）
+    preview_changed = pyqtSignal(dict)
     
     def __init__(self, config: dict, parent=None):
         super().__init__(parent)
@@ -27,30 +30,34 @@ class ConfigDialog(QDialog):
         self.setWindowTitle("设置")
         self.setMinimumSize(600, 500)
         
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(50)
+        self._preview_timer.timeout.connect(self._emit_live_preview)
+        
         self._init_ui()
-        self._load_config()
+        self._ensure_tab(self._tab_widget.currentIndex())
     
     def _init_ui(self):
         """初始化UI"""
         layout = QVBoxLayout(self)
         
-        # 标签页
-        tab_widget = QTabWidget()
-        
-        # 显示设置
-        tab_widget.addTab(self._create_display_tab(), "显示")
-        
-        # 摄像头设置
-        tab_widget.addTab(self._create_camera_tab(), "摄像头")
-        
-        # 识别设置
-        tab_widget.addTab(self._create_recognition_tab(), "识别")
+        # 标签页：先放占位页，首次切换到某页时才构建其控件并加载配置
+        # 已构建的页按键名记录，保存时据此判断，与标签页顺序无关
+        self._tab_widget = tab_widget = QTabWidget()
+        self._tab_specs = [
+            ('display', "显示", self._create_display_tab, self._load_display_config),
+            ('camera', "摄像头", self._create_camera_tab, self._load_camera_config),
+            ('recognition', "识别", self._create_recognition_tab, self._load_recognition_config),
+            ('gestures', "手势映射", self._create_gesture_tab, self._load_gesture_mappings),
+            ('effects', "特效", self._create_effects_tab, None),
+        ]
+        self._built_tabs = set()
         
-        # 手势映射
-        tab_widget.addTab(self._create_gesture_tab(), "手势映射")
+        for _, title, _, _ in self._tab_specs:
+            tab_widget.addTab(QWidget(), title)
         
-        # 特效设置
-        tab_widget.addTab(self._create_effects_tab(), "特效")
+        tab_widget.currentChanged.connect(self._ensure_tab)
         
         layout.addWidget(tab_widget)
         
@@ -73,6 +80,29 @@ class ConfigDialog(QDialog):
         
         layout.addLayout(button_layout)
     
+    def _ensure_tab(self, index: int):
+        """首次显示某个标签页时，用真实页面替换占位页并加载对应配置"""
+        if index < 0:
+            return
+        key, title, builder, loader = self._tab_specs[index]
+        if key in self._built_tabs:
+            return
+        self._built_tabs.add(key)
+        
+        tab_widget = self._tab_widget
+        tab_widget.blockSignals(True)
+        try:
+            placeholder = tab_widget.widget(index)
+            tab_widget.removeTab(index)
+            tab_widget.insertTab(index, builder(), title)
+            tab_widget.setCurrentIndex(index)
+            placeholder.deleteLater()
+        finally:
+            tab_widget.blockSignals(False)
+        
+        if loader is not None:
+            loader()
+    
     def _create_display_tab(self) -> QWidget:
         """创建显示设置标签页"""
         widget = QWidget()
@@ -86,9 +116,7 @@ class ConfigDialog(QDialog):
         self.slider_opacity.setRange(10, 90)
         self.slider_opacity.setValue(60)
         self.label_opacity = QLabel("60%")
-        self.slider_opacity.valueChanged.connect(
-            lambda v: self.label_opacity.setText(f"{v}%")
-        )
+        self.slider_opacity.valueChanged.connect(self._on_opacity_changed)
         
         opacity_row = QHBoxLayout()
         opacity_row.addWidget(self.slider_opacity)
@@ -299,20 +327,24 @@ class ConfigDialog(QDialog):
         
         return widget
     
-    def _load_config(self):
-        """加载配置到UI"""
+    def _load_display_config(self):
+        """加载显示配置到UI"""
         display = self.config.get('display', {})
         self.slider_opacity.setValue(int(display.get('background_opacity', 0.6) * 100))
         self.check_skeleton.setChecked(display.get('show_skeleton', True))
         self.check_gesture.setChecked(display.get('show_gesture_name', True))
         self.check_fps.setChecked(display.get('show_fps', True))
         self.check_blur.setChecked(display.get('blur_enabled', False))
-        
+    
+    def _load_camera_config(self):
+        """加载摄像头配置到UI"""
         camera = self.config.get('camera', {})
         self.combo_device.setCurrentIndex(camera.get('device_id', 0))
         self.check_mirror.setChecked(camera.get('mirror', True))
         self.spin_fps.setValue(camera.get('fps', 30))
-        
+    
+    def _load_recognition_config(self):
+        """加载识别与安全区域配置到UI"""
         recognition = self.config.get('recognition', {})
         self.spin_detection_conf.setValue(recognition.get('min_detection_confidence', 0.7))
         self.spin_tracking_conf.setValue(recognition.get('min_tracking_confidence', 0.5))
@@ -321,49 +353,92 @@ class ConfigDialog(QDialog):
         
         safe_zone = self.config.get('safe_zone', {})
         self.check_safe_zone_enabled.setChecked(safe_zone.get('enabled', True))
-        
-        # 加载手势映射
-        self._load_gesture_mappings()
     
     def _load_gesture_mappings(self):
         """加载手势映射到表格"""
         mappings = self.config.get('gesture_mappings', [])
-        self.table_gestures.setRowCount(len(mappings))
-        
-        for i, mapping in enumerate(mappings):
-            self.table_gestures.setItem(i, 0, QTableWidgetItem(mapping.get('display_name', '')))
-            self.table_gestures.setItem(i, 1, QTableWidgetItem(mapping.get('action_type', '')))
-            self.table_gestures.setItem(i, 2, QTableWidgetItem(mapping.get('action', '')))
-            self.table_gestures.setItem(i, 3, QTableWidgetItem(str(mapping.get('cooldown_ms', 500))))
+        table = self.table_gestures
+        
+        # 先构建所有单元格，再在关闭刷新/排序/信号的情况下批量写入，避免逐格重绘
+        rows = [
+            (QTableWidgetItem(mapping.get('display_name', '')),
+             QTableWidgetItem(mapping.get('action_type', '')),
+             QTableWidgetItem(mapping.get('action', '')),
+             QTableWidgetItem(str(mapping.get('cooldown_ms', 500))))
+            for mapping in mappings
+        ]
+        
+        sorting = table.isSortingEnabled()
+        table.setUpdatesEnabled(False)
+        table.setSortingEnabled(False)
+        table.blockSignals(True)
+        try:
+            table.setRowCount(len(rows))
+            for i, items in enumerate(rows):
+                for col, item in enumerate(items):
+                    table.setItem(i, col, item)
+        finally:
+            table.blockSignals(False)
+            table.setSortingEnabled(sorting)
+            table.setUpdatesEnabled(True)
+    
+    def _on_opacity_changed(self, value: int):
+        """透明度滑块变化：标签立即更新，预览信号节流发出"""
+        self.label_opacity.setText(f"{value}%")
+        if not self._preview_timer.isActive():
+            self._preview_timer.start()
+    
+    def _emit_live_preview(self):
+        """发出实时预览的配置"""
+        self.preview_changed.emit({
+            'display': {'background_opacity': self.slider_opacity.value() / 100}
+        })
+    
+    def done(self, result: int):
+        """accept/reject 均经过此处：先停掉待发的预览，避免取消后再把预览值发出去"""
+        self._preview_timer.stop()
+        super().done(result)
     
     def _save_config(self):
         """保存配置"""
-        self.config['display'] = {
-            'background_opacity': self.slider_opacity.value() / 100,
-            'show_skeleton': self.check_skeleton.isChecked(),
-            'show_gesture_name': self.check_gesture.isChecked(),
-            'show_fps': self.check_fps.isChecked(),
-            'blur_enabled': self.check_blur.isChecked()
-        }
-        
-        self.config['camera'] = {
-            'device_id': self.combo_device.currentIndex(),
-            'mirror': self.check_mirror.isChecked(),
-            'fps': self.spin_fps.value()
-        }
-        
-        self.config['recognition'] = {
-            'min_detection_confidence': self.spin_detection_conf.value(),
-            'min_tracking_confidence': self.spin_tracking_conf.value(),
-            'static_gesture_hold_time_ms': self.spin_hold_time.value(),
-            'gesture_cooldown_ms': self.spin_cooldown.value()
-        }
-        
-        self.config['safe_zone'] = {
-            'enabled': self.check_safe_zone_enabled.isChecked()
-        }
-        
-        self.config_changed.emit(self.config)
+        # 在原有配置项上覆盖界面中的字段，保留界面未涉及的键；未打开过的标签页不会产生变化
+        updated = {}
+        if 'display' in self._built_tabs:
+            updated['display'] = {
+                **self.config.get('display', {}),
+                'background_opacity': self.slider_opacity.value() / 100,
+                'show_skeleton': self.check_skeleton.isChecked(),
+                'show_gesture_name': self.check_gesture.isChecked(),
+                'show_fps': self.check_fps.isChecked(),
+                'blur_enabled': self.check_blur.isChecked()
+            }
+        if 'camera' in self._built_tabs:
+            updated['camera'] = {
+                **self.config.get('camera', {}),
+                'device_id': self.combo_device.currentIndex(),
+                'mirror': self.check_mirror.isChecked(),
+                'fps': self.spin_fps.value()
+            }
+        if 'recognition' in self._built_tabs:
+            updated['recognition'] = {
+                **self.config.get('recognition', {}),
+                'min_detection_confidence': self.spin_detection_conf.value(),
+                'min_tracking_confidence': self.spin_tracking_conf.value(),
+                'static_gesture_hold_time_ms': self.spin_hold_time.value(),
+                'gesture_cooldown_ms': self.spin_cooldown.value()
+            }
+            updated['safe_zone'] = {
+                **self.config.get('safe_zone', {}),
+                'enabled': self.check_safe_zone_enabled.isChecked()
+            }
+        
+        # 只发出有变化的部分，接收方无需自行比较
+        changes = {key: value for key, value in updated.items()
+                   if self.config.get(key) != value}
+        self.config.update(updated)
+        
+        if changes:
+            self.config_changed.emit(changes)
         self.accept()
     
     def _reset_config(self):
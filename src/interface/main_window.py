@@ -5,14 +5,16 @@ GestureControlPC 的主界面，包含摄像头显示、叠加层和控制功能
 
 import sys
 import logging
+from typing import Tuple
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QFrame, QApplication, QSystemTrayIcon,
     QMenu, QAction, QMessageBox
 )
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QSize, pyqtSlot, QThread
-from PyQt5.QtGui import QImage, QPixmap, QIcon, QFont, QPainter, QColor
+from PyQt5.QtCore import Qt, QEvent, QTimer, pyqtSignal, QSize, pyqtSlot, QThread
+from PyQt5.QtGui import QImage, QIcon, QFont, QPainter, QColor
 
+import cv2
 import numpy as np
 
 from .overlay import OverlayWidget, ParticleOverlay
@@ -22,41 +24,96 @@ from ..domain.gesture import GestureEvent, GestureType
 
 logger = logging.getLogger(__name__)
 
+# Format_BGR888 需要 Qt 5.14+
+_HAS_BGR888 = hasattr(QImage, 'Format_BGR888')
 
-class CameraWidget(QLabel):
-    """摄像头显示组件"""
+
+class CameraWidget(QWidget):
+    """摄像头显示组件 - 在 paintEvent 中直接绘制 QImage，不经过 QPixmap 转换"""
+    
+    # 帧宽高比变化时发出，由父窗口重新计算保持宽高比的显示区域
+    source_size_changed = pyqtSignal()
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setAlignment(Qt.AlignCenter)
-        self.setMinimumSize(640, 480)
+        # 缩小在 set_frame 中由 OpenCV 完成，放大由 drawImage 绘制时完成；组件由父窗口按帧宽高比摆放，不会拉伸变形
         self._opacity = 0.6
+        # 背景色在首次 set_opacity 之前保持透明
+        self._background: QColor = None
+        self._qimage: QImage = None
+        self._frame_ref: np.ndarray = None
+        # 缩放、通道转换或整理内存时复用的持久缓冲区，仅在尺寸变化时重新分配
+        self._scaled_buffer: np.ndarray = None
+        self._rgb_buffer: np.ndarray = None
+        self._source_size = (0, 0)
+    
+    @property
+    def source_size(self) -> Tuple[int, int]:
+        """最近一帧的 (宽, 高)，尚无帧时为 (0, 0)"""
+        return self._source_size
     
     def set_frame(self, frame: np.ndarray):
         """设置帧图像"""
         if frame is None:
             return
         
-        h, w, ch = frame.shape
-        bytes_per_line = ch * w
-        
-        # BGR转RGB
-        frame_rgb = frame[..., ::-1].copy()
+        src_h, src_w = frame.shape[:2]
         
-        q_image = QImage(frame_rgb.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(q_image)
+        # 组件比帧小时先用 INTER_AREA 缩小到显示尺寸（OpenCV SIMD），
+        # 后续通道转换和绘制的数据量按面积减少；放大仍交给 Qt 绘制时完成
+        tw, th = self.width(), self.height()
+        if 0 < tw < src_w and 0 < th < src_h:
+            self._scaled_buffer = self._ensure_buffer(self._scaled_buffer, (th, tw, 3))
+            frame = cv2.resize(frame, (tw, th), dst=self._scaled_buffer,
+                               interpolation=cv2.INTER_AREA)
         
-        # 缩放到组件大小
-        scaled_pixmap = pixmap.scaled(
-            self.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation
-        )
+        # QImage 直接引用 numpy 缓冲区，保留引用直到下一帧绘制完成
+        h, w, ch = frame.shape
+        bytes_per_line = ch * w
         
-        self.setPixmap(scaled_pixmap)
+        if _HAS_BGR888:
+            # BGR 数据直接交给 Qt，无需在 numpy 中重排通道；只有非连续的视图才整理到持久缓冲区
+            if not frame.flags['C_CONTIGUOUS']:
+                self._rgb_buffer = self._ensure_buffer(self._rgb_buffer, frame.shape)
+                np.copyto(self._rgb_buffer, frame)
+                frame = self._rgb_buffer
+            self._frame_ref = frame
+            q_image = QImage(frame.data, w, h, bytes_per_line, QImage.Format_BGR888)
+        else:
+            # 旧版 Qt：用 OpenCV 的 SIMD 通道转换写入持久缓冲区，避免 rgbSwapped 每帧新分配
+            self._rgb_buffer = self._ensure_buffer(self._rgb_buffer, frame.shape)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
+            self._frame_ref = self._rgb_buffer
+            q_image = QImage(self._rgb_buffer.data, w, h, bytes_per_line, QImage.Format_RGB888)
+        
+        self._qimage = q_image
+        self.update()
+        
+        # 上报原始帧尺寸，父窗口据此保持宽高比
+        if self._source_size != (src_w, src_h):
+            self._source_size = (src_w, src_h)
+            self.source_size_changed.emit()
+    
+    @staticmethod
+    def _ensure_buffer(buffer: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+        """尺寸一致时复用持久缓冲区，否则重新分配"""
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, dtype=np.uint8)
+        return buffer
+    
+    def paintEvent(self, event):
+        """绘制背景与最新一帧，缩放到组件大小"""
+        painter = QPainter(self)
+        if self._background is not None:
+            painter.fillRect(self.rect(), self._background)
+        if self._qimage is not None:
+            painter.drawImage(self.rect(), self._qimage)
     
     def set_opacity(self, opacity: float):
         """设置透明度"""
         self._opacity = opacity
-        self.setStyleSheet(f"background-color: rgba(0, 0, 0, {int((1-opacity)*255)});")
+        self._background = QColor(0, 0, 0, int((1 - opacity) * 255))
+        self.update()
 
 
 class MainWindow(QMainWindow):
@@ -86,9 +143,14 @@ class MainWindow(QMainWindow):
         self._is_running = False
         self._is_fullscreen = False
         
-        # 定时器
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self._update_frame)
+        # 帧推送：工作线程只保留最新结果，已有未处理的帧信号时不再重复发射
+        self._latest_result = None
+        self._frame_signal_pending = False
+        # 窗口隐藏到托盘或最小化时不刷新界面（识别继续运行）；由主线程在窗口事件中维护
+        self._ui_visible = False
+        # 状态栏标签上次显示的文字，内容不变时跳过 setText 以免触发重新布局与重绘
+        self._last_fps_text = "FPS: --"
+        self._last_gesture_text = "手势: --"
         
         # 系统托盘
         self.tray_icon: QSystemTrayIcon = None
@@ -117,6 +179,7 @@ class MainWindow(QMainWindow):
         
         # 摄像头显示
         self.camera_widget = CameraWidget(self.camera_container)
+        self.camera_widget.source_size_changed.connect(self._resize_overlays)
         
         # 叠加层
         self.overlay = OverlayWidget(self.camera_container)
@@ -248,8 +311,9 @@ class MainWindow(QMainWindow):
         # 状态变更回调（从主线程调用，安全）
         self.orchestrator.on_state_change(self._on_state_change)
         
-        # 注意：手势回调在工作线程中执行，只能发射信号
+        # 注意：手势/帧回调在工作线程中执行，只能发射信号
         self.orchestrator.on_gesture(self._emit_gesture_signal)
+        self.orchestrator.on_frame(self._emit_frame_signal)
     
     def _on_state_change(self, old_state: SystemState, new_state: SystemState):
         """状态变更回调"""
@@ -279,14 +343,10 @@ class MainWindow(QMainWindow):
             self.label_status.setText("运行中")
             self.label_status.setStyleSheet("color: #00ff00; font-size: 14px;")
             
-            # 启动更新定时器
-            self.update_timer.start(33)  # ~30fps
-            
             logger.info("系统已启动")
     
     def _stop(self):
         """停止系统"""
-        self.update_timer.stop()
         self.orchestrator.stop()
         
         self._is_running = False
@@ -297,48 +357,6 @@ class MainWindow(QMainWindow):
         
         logger.info("系统已停止")
     
-    def _update_frame(self):
-        """更新帧显示 - 在主线程中安全调用"""
-        try:
-            if not self._is_running:
-                return
-                
-            result = self.orchestrator.get_latest_result()
-            if result:
-                frame = result.get('frame')
-                if frame is not None:
-                    self.camera_widget.set_frame(frame)
-                
-                # 更新叠加层
-                landmarks = result.get('landmarks', [])
-                self.overlay.set_landmarks(landmarks)
-                
-                gesture_event = result.get('gesture_event')
-                if gesture_event and self.orchestrator.gesture_service:
-                    try:
-                        name = self.orchestrator.gesture_service.get_gesture_name(
-                            gesture_event.gesture_type
-                        )
-                        self.overlay.set_gesture(gesture_event.gesture_type, name)
-                        self.label_gesture.setText(f"手势: {name}")
-                    except Exception:
-                        pass
-                
-                # 更新FPS
-                fps = result.get('fps', 0)
-                self.overlay.set_fps(fps)
-                self.label_fps.setText(f"FPS: {fps:.1f}")
-                
-                # 更新粒子
-                if self.orchestrator.action_service:
-                    try:
-                        particles = self.orchestrator.action_service.effect_renderer.particle_pool.get_active_particles()
-                        self.particle_overlay.set_particles(particles)
-                    except Exception:
-                        pass
-        except Exception as e:
-            logger.debug(f"帧更新异常: {e}")
-    
     def _toggle_fullscreen(self):
         """切换全屏"""
         if self._is_fullscreen:
@@ -357,10 +375,20 @@ class MainWindow(QMainWindow):
         
         dialog = ConfigDialog(config, self)
         dialog.config_changed.connect(self._apply_config)
-        dialog.exec_()
+        dialog.preview_changed.connect(self._preview_config)
+        if not dialog.exec_():
+            # 取消时撤销实时预览
+            display = config.get('display', {})
+            self.camera_widget.set_opacity(display.get('background_opacity', 0.6))
+    
+    def _preview_config(self, config: dict):
+        """实时预览配置（不保存）"""
+        display = config.get('display', {})
+        if 'background_opacity' in display:
+            self.camera_widget.set_opacity(display['background_opacity'])
     
     def _apply_config(self, config: dict):
-        """应用配置"""
+        """应用配置（config 只包含发生变化的顶层配置项）"""
         # 更新配置管理器
         for key, value in config.items():
             if key != 'gesture_mappings':
@@ -373,15 +401,16 @@ class MainWindow(QMainWindow):
         self.orchestrator.reload_config()
         
         # 更新显示
-        display = config.get('display', {})
-        opacity = display.get('background_opacity', 0.6)
-        self.camera_widget.set_opacity(opacity)
-        
-        self.overlay.set_display_options(
-            skeleton=display.get('show_skeleton', True),
-            gesture=display.get('show_gesture_name', True),
-            fps=display.get('show_fps', True)
-        )
+        if 'display' in config:
+            display = config['display']
+            opacity = display.get('background_opacity', 0.6)
+            self.camera_widget.set_opacity(opacity)
+            
+            self.overlay.set_display_options(
+                skeleton=display.get('show_skeleton', True),
+                gesture=display.get('show_gesture_name', True),
+                fps=display.get('show_fps', True)
+            )
         
         logger.info("配置已应用")
     
@@ -412,11 +441,65 @@ class MainWindow(QMainWindow):
         except Exception as e:
             logger.debug(f"手势处理异常: {e}")
     
+    def _emit_frame_signal(self, result: dict):
+        """发射帧信号（在工作线程中调用）"""
+        self._latest_result = result
+        if not self._ui_visible:
+            return
+        if not self._frame_signal_pending:
+            self._frame_signal_pending = True
+            self._frame_ready.emit(result)
+    
     @pyqtSlot(object)
     def _handle_frame_update(self, result):
-        """处理帧更新（在主线程中执行）"""
-        # 预留接口，当前由定时器拉取
-        pass
+        """处理帧更新（在主线程中执行），总是显示最新的一帧"""
+        self._frame_signal_pending = False
+        result = self._latest_result
+        try:
+            if not self._is_running:
+                return
+            
+            if result:
+                frame = result.get('frame')
+                if frame is not None:
+                    self.camera_widget.set_frame(frame)
+                
+                # 更新叠加层
+                landmarks = result.get('landmarks', [])
+                self.overlay.set_landmarks(landmarks)
+                
+                gesture_event = result.get('gesture_event')
+                if gesture_event and self.orchestrator.gesture_service:
+                    try:
+                        name = self.orchestrator.gesture_service.get_gesture_name(
+                            gesture_event.gesture_type
+                        )
+                        self.overlay.set_gesture(gesture_event.gesture_type, name)
+                        gesture_text = f"手势: {name}"
+                        if gesture_text != self._last_gesture_text:
+                            self._last_gesture_text = gesture_text
+                            self.label_gesture.setText(gesture_text)
+                    except Exception:
+                        pass
+                
+                # 更新FPS（量化到一位小数，标签与叠加层共用）
+                fps = round(result.get('fps', 0), 1)
+                self.overlay.set_fps(fps)
+                fps_text = f"FPS: {fps:.1f}"
+                if fps_text != self._last_fps_text:
+                    self._last_fps_text = fps_text
+                    self.label_fps.setText(fps_text)
+                self.overlay.flush()
+                
+                # 更新粒子
+                if self.orchestrator.action_service:
+                    try:
+                        pool = self.orchestrator.action_service.effect_renderer.particle_pool
+                        self.particle_overlay.set_particle_pool(pool)
+                    except Exception:
+                        pass
+        except Exception as e:
+            logger.debug(f"帧更新异常: {e}")
     
     def _tray_activated(self, reason):
         """托盘图标激活"""
@@ -434,7 +517,14 @@ class MainWindow(QMainWindow):
         container_size = self.camera_container.size()
         w, h = container_size.width(), container_size.height()
         if w > 0 and h > 0:
-            self.camera_widget.setGeometry(0, 0, w, h)
+            # 摄像头画面按帧宽高比居中摆放（其余区域留黑边）
+            fw, fh = self.camera_widget.source_size
+            if fw > 0 and fh > 0:
+                scale = min(w / fw, h / fh)
+                cw, ch = int(fw * scale), int(fh * scale)
+                self.camera_widget.setGeometry((w - cw) // 2, (h - ch) // 2, cw, ch)
+            else:
+                self.camera_widget.setGeometry(0, 0, w, h)
             self.overlay.setGeometry(0, 0, w, h)
             self.particle_overlay.setGeometry(0, 0, w, h)
     
@@ -443,6 +533,26 @@ class MainWindow(QMainWindow):
         super().showEvent(event)
         # 延迟调整大小，确保布局完成
         QTimer.singleShot(100, self._resize_overlays)
+        self._update_ui_visible()
+    
+    def hideEvent(self, event):
+        """窗口隐藏事件"""
+        super().hideEvent(event)
+        self._update_ui_visible()
+    
+    def changeEvent(self, event):
+        """窗口状态变化（最小化/还原）"""
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self._update_ui_visible()
+    
+    def _update_ui_visible(self):
+        """根据窗口可见性决定是否刷新界面，重新可见时立即显示最新一帧"""
+        visible = self.isVisible() and not (self.windowState() & Qt.WindowMinimized)
+        if visible and not self._ui_visible and self._latest_result is not None:
+            self._ui_visible = True
+            self._emit_frame_signal(self._latest_result)
+        self._ui_visible = visible
     
     def resizeEvent(self, event):
         """窗口大小改变事件"""
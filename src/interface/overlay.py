@@ -4,17 +4,38 @@ Overlay Widget - 叠加层组件
 """
 
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtCore import Qt, QRect, QPoint, QTimer
+from PyQt5.QtCore import Qt, QRect, QPoint, QLine, QTimer
 from PyQt5.QtGui import QPainter, QPen, QColor, QFont, QBrush, QPainterPath
 import math
 from typing import List, Optional, Tuple
 
+import numpy as np
+
 from ..domain.gesture import HandLandmarks, GestureType
+from ..domain.effect import pack_rgb
+from ..domain.effect_kernels import to_pixels
 
 
 class OverlayWidget(QWidget):
     """叠加层组件 - 绘制骨架、提示、安全区域"""
     
+    # 骨骼连接（关键点索引对）
+    _CONNECTIONS = np.array([
+        # 拇指
+        (0, 1), (1, 2), (2, 3), (3, 4),
+        # 食指
+        (0, 5), (5, 6), (6, 7), (7, 8),
+        # 中指
+        (5, 9), (9, 10), (10, 11), (11, 12),
+        # 无名指
+        (9, 13), (13, 14), (14, 15), (15, 16),
+        # 小指
+        (13, 17), (0, 17), (17, 18), (18, 19), (19, 20)
+    ], dtype=np.intp)
+    # 指尖与其余关节（分组绘制，每组只设置一次画刷）
+    _TIP_IDS = np.array([4, 8, 12, 16, 20], dtype=np.intp)
+    _JOINT_IDS = np.setdiff1d(np.arange(21), _TIP_IDS)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
@@ -30,6 +51,10 @@ class OverlayWidget(QWidget):
         self._show_safe_zone: bool = True
         self._safe_zone: Tuple[float, float, float, float] = (0.2, 0.8, 0.2, 0.8)
         
+        # 待合并的重绘：骨架/手势变化需整体重绘，仅FPS变化只重绘文字区域
+        self._dirty = False
+        self._fps_dirty = False
+        
         # 显示设置
         self._show_skeleton = True
         self._show_gesture_name = True
@@ -44,25 +69,59 @@ class OverlayWidget(QWidget):
         # 颜色配置
         self._skeleton_color = QColor(0, 255, 255, 200)
         self._joint_color = QColor(0, 255, 0, 230)
+        self._tip_color = QColor(255, 100, 100, 230)
         self._safe_zone_color = QColor(100, 149, 237, 50)
         self._text_color = QColor(255, 255, 255, 230)
         self._feedback_color = QColor(50, 205, 50, 200)
+        
+        # 绘制用的画笔/画刷/字体只创建一次，绘制时直接复用
+        self._skeleton_pen = QPen(self._skeleton_color)
+        self._skeleton_pen.setWidth(3)
+        self._joint_pen = QPen(Qt.white, 1)
+        self._joint_brush = QBrush(self._joint_color)
+        self._tip_brush = QBrush(self._tip_color)
+        self._safe_zone_pen = QPen(QColor(100, 149, 237, 150))
+        self._safe_zone_pen.setWidth(2)
+        self._safe_zone_pen.setStyle(Qt.DashLine)
+        self._safe_zone_label_color = QColor(100, 149, 237, 200)
+        self._shadow_color = QColor(0, 0, 0, 150)
+        self._feedback_pen = QPen(self._feedback_color, 2)
+        self._feedback_brush = QBrush(QColor(0, 0, 0, 150))
+        # FPS 颜色阈值表（从高到低）
+        self._fps_colors = [(25, QColor(50, 205, 50)), (15, QColor(255, 165, 0)), (0, QColor(255, 69, 0))]
+        self._label_font = QFont("Microsoft YaHei", 10)
+        self._gesture_font = QFont("Microsoft YaHei", 24, QFont.Bold)
+        self._fps_font = QFont("Consolas", 14)
+        self._feedback_font = QFont("Microsoft YaHei", 18, QFont.Bold)
     
     def set_landmarks(self, landmarks: List[HandLandmarks]):
-        """设置手部关键点"""
+        """设置手部关键点（随帧更新，重绘推迟到 flush）"""
+        if landmarks or self._landmarks:
+            self._dirty = True
         self._landmarks = landmarks
-        self.update()
     
     def set_gesture(self, gesture: Optional[GestureType], name: str = ""):
-        """设置当前手势"""
+        """设置当前手势（随帧更新，重绘推迟到 flush）"""
+        if gesture != self._current_gesture or name != self._gesture_name:
+            self._dirty = True
         self._current_gesture = gesture
         self._gesture_name = name
-        self.update()
     
     def set_fps(self, fps: float):
-        """设置FPS显示"""
+        """设置FPS显示（随帧更新，重绘推迟到 flush）"""
+        if f"{fps:.1f}" != f"{self._fps:.1f}":
+            self._fps_dirty = True
         self._fps = fps
-        self.update()
+    
+    def flush(self):
+        """每帧调用一次：把本帧累积的变化合并为一次重绘"""
+        if self._dirty:
+            self.update()
+        elif self._fps_dirty and self._show_fps:
+            # 只有FPS文字变化时只重绘右上角
+            self.update(QRect(self.width() - 110, 0, 110, 40))
+        self._dirty = False
+        self._fps_dirty = False
     
     def show_action_feedback(self, text: str, duration_ms: int = 1000):
         """显示动作反馈"""
@@ -94,8 +153,8 @@ class OverlayWidget(QWidget):
     
     def paintEvent(self, event):
         """绑定事件"""
+        # 高频刷新的安全区、骨架不开抗锯齿，只在绘制提示文字时开启
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
         
         w, h = self.width(), self.height()
         
@@ -108,14 +167,16 @@ class OverlayWidget(QWidget):
             for landmarks in self._landmarks:
                 self._draw_skeleton(painter, landmarks, w, h)
         
-        # 绘制手势名称
-        if self._show_gesture_name and self._gesture_name:
-            self._draw_gesture_name(painter, w, h)
-        
         # 绘制FPS
         if self._show_fps:
             self._draw_fps(painter, w, h)
         
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        # 绘制手势名称
+        if self._show_gesture_name and self._gesture_name:
+            self._draw_gesture_name(painter, w, h)
+        
         # 绘制动作反馈
         if self._action_feedback:
             self._draw_action_feedback(painter, w, h)
@@ -133,16 +194,12 @@ class OverlayWidget(QWidget):
         painter.fillRect(x, y, width, height, self._safe_zone_color)
         
         # 绘制边框
-        pen = QPen(QColor(100, 149, 237, 150))
-        pen.setWidth(2)
-        pen.setStyle(Qt.DashLine)
-        painter.setPen(pen)
+        painter.setPen(self._safe_zone_pen)
         painter.drawRect(x, y, width, height)
         
         # 标注
-        painter.setPen(QColor(100, 149, 237, 200))
-        font = QFont("Microsoft YaHei", 10)
-        painter.setFont(font)
+        painter.setPen(self._safe_zone_label_color)
+        painter.setFont(self._label_font)
         painter.drawText(x + 5, y + 20, "安全区域")
     
     def _draw_skeleton(self, painter: QPainter, landmarks: HandLandmarks, w: int, h: int):
@@ -150,54 +207,31 @@ class OverlayWidget(QWidget):
         if len(landmarks.landmarks) < 21:
             return
         
-        # 转换坐标
-        points = [(int(lm[0] * w), int(lm[1] * h)) for lm in landmarks.landmarks]
-        
-        # 定义骨骼连接
-        connections = [
-            # 拇指
-            (0, 1), (1, 2), (2, 3), (3, 4),
-            # 食指
-            (0, 5), (5, 6), (6, 7), (7, 8),
-            # 中指
-            (5, 9), (9, 10), (10, 11), (11, 12),
-            # 无名指
-            (9, 13), (13, 14), (14, 15), (15, 16),
-            # 小指
-            (13, 17), (0, 17), (17, 18), (18, 19), (19, 20)
-        ]
-        
-        # 绘制连接线
-        pen = QPen(self._skeleton_color)
-        pen.setWidth(3)
-        painter.setPen(pen)
-        
-        for start, end in connections:
-            if start < len(points) and end < len(points):
-                painter.drawLine(points[start][0], points[start][1],
-                               points[end][0], points[end][1])
-        
-        # 绘制关节点
-        for i, point in enumerate(points):
-            # 指尖用大一点的圆
-            if i in [4, 8, 12, 16, 20]:
-                radius = 8
-                color = QColor(255, 100, 100, 230)
-            else:
-                radius = 5
-                color = self._joint_color
-            
-            painter.setBrush(QBrush(color))
-            painter.setPen(QPen(Qt.white, 1))
-            painter.drawEllipse(QPoint(point[0], point[1]), radius, radius)
+        # 转换坐标：(21, 2) 整数像素坐标；叠加层与采集分辨率一致时直接使用产生方的像素坐标
+        if landmarks.image_size == (w, h):
+            points = landmarks.pixel_xy
+        else:
+            points = to_pixels(landmarks.landmarks, w, h)
+        
+        # 绘制连接线：一次 drawLines 批量提交
+        painter.setPen(self._skeleton_pen)
+        segments = points[self._CONNECTIONS].reshape(-1, 4).tolist()
+        painter.drawLines([QLine(x1, y1, x2, y2) for x1, y1, x2, y2 in segments])
+        
+        # 绘制关节点：指尖用大一点的圆
+        painter.setPen(self._joint_pen)
+        for ids, radius, brush in ((self._JOINT_IDS, 5, self._joint_brush),
+                                   (self._TIP_IDS, 8, self._tip_brush)):
+            painter.setBrush(brush)
+            for x, y in points[ids].tolist():
+                painter.drawEllipse(QPoint(x, y), radius, radius)
     
     def _draw_gesture_name(self, painter: QPainter, w: int, h: int):
         """绘制手势名称"""
-        font = QFont("Microsoft YaHei", 24, QFont.Bold)
-        painter.setFont(font)
+        painter.setFont(self._gesture_font)
         
         # 绘制阴影
-        painter.setPen(QColor(0, 0, 0, 150))
+        painter.setPen(self._shadow_color)
         painter.drawText(w // 2 - 100 + 2, 52, self._gesture_name)
         
         # 绘制文字
@@ -206,33 +240,30 @@ class OverlayWidget(QWidget):
     
     def _draw_fps(self, painter: QPainter, w: int, h: int):
         """绘制FPS"""
-        font = QFont("Consolas", 14)
-        painter.setFont(font)
+        painter.setFont(self._fps_font)
         
         fps_text = f"FPS: {self._fps:.1f}"
         
         # 根据FPS选择颜色
-        if self._fps >= 25:
-            color = QColor(50, 205, 50)
-        elif self._fps >= 15:
-            color = QColor(255, 165, 0)
-        else:
-            color = QColor(255, 69, 0)
+        color = self._fps_colors[-1][1]
+        for threshold, c in self._fps_colors:
+            if self._fps >= threshold:
+                color = c
+                break
         
         painter.setPen(color)
         painter.drawText(w - 100, 30, fps_text)
     
     def _draw_action_feedback(self, painter: QPainter, w: int, h: int):
         """绘制动作反馈"""
-        font = QFont("Microsoft YaHei", 18, QFont.Bold)
-        painter.setFont(font)
+        painter.setFont(self._feedback_font)
         
         # 绘制背景框
         text_width = len(self._action_feedback) * 20 + 40
         rect = QRect(w // 2 - text_width // 2, h // 2 - 30, text_width, 60)
         
-        painter.setBrush(QBrush(QColor(0, 0, 0, 150)))
-        painter.setPen(QPen(self._feedback_color, 2))
+        painter.setBrush(self._feedback_brush)
+        painter.setPen(self._feedback_pen)
         painter.drawRoundedRect(rect, 10, 10)
         
         # 绘制文字
@@ -240,76 +271,142 @@ class OverlayWidget(QWidget):
         painter.drawText(rect, Qt.AlignCenter, self._action_feedback)
 
 
+def _build_star_template() -> QPainterPath:
+    """单位半径的5角星路径（外顶点半径1，内顶点半径0.5，首个顶点朝上）"""
+    path = QPainterPath()
+    for i in range(10):
+        angle = math.radians(i * 36 - 90)
+        r = 1.0 if i % 2 == 0 else 0.5
+        px, py = r * math.cos(angle), r * math.sin(angle)
+        if i == 0:
+            path.moveTo(px, py)
+        else:
+            path.lineTo(px, py)
+    path.closeSubpath()
+    return path
+
+
 class ParticleOverlay(QWidget):
     """粒子特效叠加层"""
     
+    _STAR_TEMPLATE = _build_star_template()
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
         self.setAttribute(Qt.WA_TransparentForMouseEvents)
         self.setAttribute(Qt.WA_TranslucentBackground)
         
-        self._particles = []
+        # 列表模式下的粒子快照：(x, y, size, rotation, color, alpha, glow) 数组，只含存活粒子
+        self._arrays: Optional[Tuple[np.ndarray, ...]] = None
+        self._pool = None
+        
+        # 画笔/画刷缓存：透明度量化为 16 级，画刷数量不超过 16 × 颜色数
+        self._no_pen = QPen(Qt.NoPen)
+        self._brush_cache: dict = {}
     
     def set_particles(self, particles: list):
-        """设置粒子列表"""
-        self._particles = particles
+        """设置粒子列表，存活过滤与字段提取在此一次完成，绘制时不再逐个访问属性"""
+        alive = [p for p in particles if p.is_alive]
+        if not alive:
+            self._arrays = None
+        else:
+            self._arrays = (
+                np.array([p.x for p in alive], dtype=np.float32),
+                np.array([p.y for p in alive], dtype=np.float32),
+                np.array([p.size for p in alive], dtype=np.float32),
+                np.array([p.rotation for p in alive], dtype=np.float32),
+                np.array([pack_rgb(*p.color) for p in alive], dtype=np.uint32),
+                np.array([p.alpha for p in alive], dtype=np.float32),
+                np.array([p.glow for p in alive], dtype=np.bool_),
+            )
+        self.update()
+    
+    def set_particle_pool(self, pool):
+        """设置粒子对象池，绘制时直接遍历活跃粒子，避免每帧复制列表"""
+        self._pool = pool
         self.update()
     
     def paintEvent(self, event):
         """绑定事件"""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        if self._pool is not None:
+            soa = self._pool.soa
+            slots = self._pool.active_slots()
+            arrays = (soa.x[slots], soa.y[slots], soa.size[slots], soa.rotation[slots],
+                      soa.color[slots], soa.alpha[slots], soa.glow[slots])
+        else:
+            arrays = self._arrays
         
-        w, h = self.width(), self.height()
+        if arrays is None or arrays[0].size == 0:
+            return
         
-        for particle in self._particles:
-            if not particle.is_alive:
-                continue
-            
-            x = int(particle.x * w)
-            y = int(particle.y * h)
-            size = int(particle.size)
-            
-            # 颜色和透明度
-            r, g, b = particle.color
-            alpha = int(particle.alpha * 255)
-            color = QColor(r, g, b, alpha)
-            
-            # 发光效果
-            if particle.glow:
-                for i in range(3, 0, -1):
-                    glow_alpha = alpha // (i * 2)
-                    glow_color = QColor(r, g, b, glow_alpha)
-                    painter.setBrush(QBrush(glow_color))
-                    painter.setPen(Qt.NoPen)
-                    painter.drawEllipse(QPoint(x, y), size + i * 3, size + i * 3)
-            
-            # 绘制粒子
-            painter.setBrush(QBrush(color))
-            painter.setPen(Qt.NoPen)
-            
-            # 绘制星形
-            if particle.size > 4:
-                self._draw_star(painter, x, y, size, particle.rotation)
-            else:
-                painter.drawEllipse(QPoint(x, y), size, size)
+        # 粒子随视频运动，不开抗锯齿
+        painter = QPainter(self)
+        self._paint_arrays(painter, self.width(), self.height(), *arrays)
+    
+    def _paint_arrays(self, painter: QPainter, w: int, h: int,
+                      x: np.ndarray, y: np.ndarray, size: np.ndarray, rotation: np.ndarray,
+                      color: np.ndarray, alpha: np.ndarray, glow: np.ndarray):
+        """
+        按 SoA 数组绘制存活粒子
+        
+        坐标、大小、透明度一次向量化算出；按 (颜色, 透明度级) 分桶，每桶只设置一次缓存的画刷。
+        先画所有光晕再画粒子本体。
+        """
+        xs = (x * w).astype(np.int32).tolist()
+        ys = (y * h).astype(np.int32).tolist()
+        sizes = size.astype(np.int32).tolist()
+        rotations = rotation.tolist()
+        alphas = (alpha * 255).astype(np.int64)
+        
+        painter.setPen(self._no_pen)
+        
+        # 发光效果：三层逐渐变大变淡的圆
+        glow_sel = np.flatnonzero(glow)
+        if glow_sel.size:
+            for i in range(3, 0, -1):
+                grow = i * 3
+                for brush, group in self._buckets(color[glow_sel], alphas[glow_sel] // (i * 2)):
+                    painter.setBrush(brush)
+                    for k in glow_sel[group].tolist():
+                        painter.drawEllipse(QPoint(xs[k], ys[k]), sizes[k] + grow, sizes[k] + grow)
+        
+        # 绘制粒子：大粒子画星形，小粒子画圆
+        is_star = (size > 4).tolist()
+        for brush, group in self._buckets(color, alphas):
+            painter.setBrush(brush)
+            for k in group.tolist():
+                if is_star[k]:
+                    self._draw_star(painter, xs[k], ys[k], sizes[k], rotations[k])
+                else:
+                    painter.drawEllipse(QPoint(xs[k], ys[k]), sizes[k], sizes[k])
+    
+    def _buckets(self, colors: np.ndarray, alphas: np.ndarray):
+        """按 (打包颜色, 透明度级) 分组，产出 (画刷, 组内下标)"""
+        levels = np.clip(alphas, 0, 255) >> 4
+        keys = (colors.astype(np.int64) << 4) | levels
+        order = np.argsort(keys, kind='stable')
+        bounds = np.flatnonzero(np.diff(keys[order])) + 1
+        for group in np.split(order, bounds):
+            yield self._brush(int(keys[group[0]])), group
+    
+    def _brush(self, key: int) -> QBrush:
+        """取 (打包颜色 << 4 | 透明度级) 对应的缓存画刷"""
+        brush = self._brush_cache.get(key)
+        if brush is None:
+            if len(self._brush_cache) >= 4096:
+                self._brush_cache.clear()
+            c, level = key >> 4, key & 0xF
+            # 级别 0..15 映射到 0..255
+            brush = QBrush(QColor((c >> 16) & 0xFF, (c >> 8) & 0xFF, c & 0xFF, level * 17))
+            self._brush_cache[key] = brush
+        return brush
     
     def _draw_star(self, painter: QPainter, x: int, y: int, size: int, rotation: float):
-        """绘制星形"""
-        path = QPainterPath()
-        
-        points = []
-        for i in range(10):
-            angle = math.radians(rotation + i * 36 - 90)
-            r = size if i % 2 == 0 else size // 2
-            px = x + r * math.cos(angle)
-            py = y + r * math.sin(angle)
-            points.append((px, py))
-        
-        path.moveTo(points[0][0], points[0][1])
-        for px, py in points[1:]:
-            path.lineTo(px, py)
-        path.closeSubpath()
-        
-        painter.drawPath(path)
+        """绘制星形：平移、旋转、缩放单位模板，不再逐帧计算顶点"""
+        painter.save()
+        painter.translate(x, y)
+        painter.rotate(rotation)
+        painter.scale(size, size)
+        painter.drawPath(self._STAR_TEMPLATE)
+        painter.restore()
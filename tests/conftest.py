@@ -0,0 +1,10 @@
+"""
+测试公共配置
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径（整个测试会话只执行一次）；测试统一经 src 包导入，与 main.py 一致，
+# 各模块只以一个名字加载（application/infrastructure 内含 "from ..domain" 相对导入）
+sys.path.insert(0, str(Path(__file__).parent.parent))
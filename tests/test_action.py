@@ -3,12 +3,8 @@
 """
 
 import pytest
-import sys
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
-from domain.action import Action, ActionType, ActionResult, ActionMapping
+from src.domain.action import Action, ActionType, ActionResult, ActionMapping
 
 
 class TestAction:
@@ -135,6 +131,16 @@ class TestActionMapping:
         assert len(all_mappings) == 2
         assert "a" in all_mappings
         assert "b" in all_mappings
+    
+    def test_cooldown(self):
+        """测试动作冷却"""
+        mapping = ActionMapping()
+        mapping.register("fist", Action(ActionType.MOUSE, "left_click", cooldown_ms=10000))
+        
+        assert not mapping.is_in_cooldown("fist")
+        mapping.mark_triggered("fist")
+        assert mapping.is_in_cooldown("fist")
+        assert not mapping.is_in_cooldown("unknown")
 
 
 if __name__ == "__main__":
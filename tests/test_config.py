@@ -3,124 +3,176 @@
 """
 
 import pytest
-import sys
-import tempfile
+import copy
+import io
 import json
-from pathlib import Path
+from pathlib import PurePosixPath
 
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from src.application import config_manager
+from src.application.config_manager import ConfigManager
 
-from application.config_manager import ConfigManager
+# ConfigManager 的配置缓存字段，可变测试结束后按快照恢复
+_CACHE_FIELDS = ('_settings', '_gestures', '_effects', '_calibration', '_gesture_index')
 
 
-class TestConfigManager:
-    """测试配置管理器"""
+class _FakeFile(io.StringIO):
+    """写模式的内存文件，关闭时把内容存回 FakeFS"""
     
-    def test_create_config_manager(self):
-        """测试创建配置管理器"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            cm = ConfigManager(tmpdir)
-            cm.load_all()
-            
-            assert cm.settings is not None
-            assert cm.gestures is not None
-            assert cm.effects is not None
+    def __init__(self, files: dict, key: str):
+        super().__init__()
+        self._files = files
+        self._key = key
     
-    def test_default_settings(self):
-        """测试默认设置"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            cm = ConfigManager(tmpdir)
-            cm.load_all()
-            
-            assert 'camera' in cm.settings
-            assert 'display' in cm.settings
-            assert 'recognition' in cm.settings
+    def close(self):
+        if not self.closed:
+            self._files[self._key] = self.getvalue()
+        super().close()
+
+
+class FakeFS:
+    """内存文件系统：替换 config_manager 模块中的 open 与 Path，只测逻辑不触碰磁盘"""
     
-    def test_get_camera_config(self):
-        """测试获取摄像头配置"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            cm = ConfigManager(tmpdir)
-            cm.load_all()
-            
-            camera = cm.get_camera_config()
-            
-            assert 'device_id' in camera
-            assert 'width' in camera
-            assert 'height' in camera
+    def __init__(self):
+        self.files = {}
+        files = self.files
+        
+        class FakePath(PurePosixPath):
+            def exists(self):
+                return str(self) in files
+            
+            def mkdir(self, parents=False, exist_ok=False):
+                pass
+        
+        self.Path = FakePath
     
-    def test_get_gesture_mappings(self):
-        """测试获取手势映射"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            cm = ConfigManager(tmpdir)
-            cm.load_all()
-            
-            mappings = cm.get_gesture_mappings()
-            
-            assert isinstance(mappings, list)
-            assert len(mappings) > 0
+    def open(self, path, mode='r', encoding=None):
+        key = str(path)
+        if 'w' in mode:
+            return _FakeFile(self.files, key)
+        if key not in self.files:
+            raise FileNotFoundError(key)
+        return io.StringIO(self.files[key])
     
-    def test_update_setting(self):
+    def install(self, monkeypatch):
+        monkeypatch.setattr(config_manager, "open", self.open, raising=False)
+        monkeypatch.setattr(config_manager, "Path", self.Path)
+
+
+@pytest.fixture(scope="module")
+def loaded_cm():
+    """整个模块共用一个在内存文件系统上加载默认配置的管理器"""
+    fs = FakeFS()
+    with pytest.MonkeyPatch.context() as mp:
+        fs.install(mp)
+        cm = ConfigManager("cfg")
+        cm.load_all()
+        # 其余配置按需加载，在替换文件系统期间全部触发一次
+        cm.gestures, cm.effects, cm.calibration
+    assert set(fs.files) == {f"cfg/{name}.json" for name in ('settings', 'gestures', 'effects', 'calibration')}
+    return cm
+
+
+@pytest.fixture
+def cm(loaded_cm):
+    """供会修改配置的测试使用：结束后恢复内存中的配置"""
+    snapshot = {name: copy.deepcopy(getattr(loaded_cm, name)) for name in _CACHE_FIELDS}
+    yield loaded_cm
+    for name, value in snapshot.items():
+        setattr(loaded_cm, name, value)
+
+
+# 只读检查：共用模块级管理器，每项单独报告结果
+_INVARIANTS = [
+    ("settings_loaded", lambda cm: cm.settings is not None),
+    ("gestures_loaded", lambda cm: cm.gestures is not None),
+    ("effects_loaded", lambda cm: cm.effects is not None),
+    ("settings_has_camera", lambda cm: 'camera' in cm.settings),
+    ("settings_has_display", lambda cm: 'display' in cm.settings),
+    ("settings_has_recognition", lambda cm: 'recognition' in cm.settings),
+    ("camera_has_device_id", lambda cm: 'device_id' in cm.get_camera_config()),
+    ("camera_has_width", lambda cm: 'width' in cm.get_camera_config()),
+    ("camera_has_height", lambda cm: 'height' in cm.get_camera_config()),
+    ("gesture_mappings_is_list", lambda cm: isinstance(cm.get_gesture_mappings(), list)),
+    ("gesture_mappings_not_empty", lambda cm: len(cm.get_gesture_mappings()) > 0),
+    ("star_heart_exists", lambda cm: cm.get_effect_config('star_heart') is not None),
+    ("star_heart_has_particle_count", lambda cm: 'particle_count' in cm.get_effect_config('star_heart')),
+]
+
+
+class TestConfigManager:
+    """测试配置管理器"""
+    
+    @pytest.mark.parametrize("check", [c for _, c in _INVARIANTS], ids=[n for n, _ in _INVARIANTS])
+    def test_config_invariants(self, loaded_cm, check):
+        """测试默认配置的创建、分区与便捷访问方法"""
+        assert check(loaded_cm)
+    
+    def test_update_setting(self, cm):
         """测试更新设置"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            cm = ConfigManager(tmpdir)
-            cm.load_all()
-            
-            cm.update_setting('display.show_fps', False)
-            
-            assert cm.settings['display']['show_fps'] == False
+        cm.update_setting('display.show_fps', False)
+        
+        assert cm.settings['display']['show_fps'] == False
     
-    def test_save_and_load(self):
-        """测试保存和加载"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # 创建并保存
-            cm1 = ConfigManager(tmpdir)
-            cm1.load_all()
-            cm1.update_setting('camera.fps', 60)
-            cm1.save_all()
-            
-            # 重新加载
-            cm2 = ConfigManager(tmpdir)
-            cm2.load_all()
-            
-            assert cm2.settings['camera']['fps'] == 60
+    def test_update_gesture_mapping(self, cm):
+        """测试按手势名查找、替换与追加映射"""
+        assert cm.get_gesture_mapping('fist')['action'] == 'left_click'
+        assert cm.get_gesture_mapping('rock') is None
+        
+        cm.update_gesture_mapping('fist', {'gesture': 'fist', 'action': 'right_click'})
+        cm.update_gesture_mapping('rock', {'gesture': 'rock', 'action': 'esc'})
+        
+        assert cm.get_gesture_mapping('fist')['action'] == 'right_click'
+        assert cm.get_gesture_mapping('rock') is cm.get_gesture_mappings()[-1]
     
-    def test_get_effect_config(self):
-        """测试获取特效配置"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            cm = ConfigManager(tmpdir)
-            cm.load_all()
-            
-            star_heart = cm.get_effect_config('star_heart')
-            
-            assert star_heart is not None
-            assert 'particle_count' in star_heart
+    def test_gesture_mapping_external_edit(self, cm):
+        """测试直接修改映射列表（长度不变）后仍能按手势名查到并原地替换"""
+        mappings = cm.get_gesture_mappings()
+        mappings[2] = {'gesture': 'rock', 'action': 'esc'}
+        
+        assert cm.get_gesture_mapping('rock') is mappings[2]
+        
+        cm.update_gesture_mapping('rock', {'gesture': 'rock', 'action': 'enter'})
+        
+        assert [m['gesture'] for m in mappings].count('rock') == 1
+        assert mappings[2]['action'] == 'enter'
+    
+    def test_save_and_load(self, tmp_path):
+        """测试保存和加载（真实磁盘，端到端）"""
+        # 创建并保存
+        cm1 = ConfigManager(str(tmp_path))
+        cm1.load_all()
+        cm1.update_setting('camera.fps', 60)
+        cm1.save_all()
+        
+        # 重新加载
+        cm2 = ConfigManager(str(tmp_path))
+        cm2.load_all()
+        
+        assert cm2.settings['camera']['fps'] == 60
     
-    def test_deep_merge(self):
+    def test_deep_merge(self, loaded_cm):
         """测试深度合并"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            cm = ConfigManager(tmpdir)
-            
-            default = {
-                'a': {
-                    'b': 1,
-                    'c': 2
-                },
-                'd': 3
-            }
-            
-            override = {
-                'a': {
-                    'b': 10
-                },
-                'e': 5
-            }
-            
-            result = cm._deep_merge(default, override)
-            
-            assert result['a']['b'] == 10
-            assert result['a']['c'] == 2
-            assert result['d'] == 3
-            assert result['e'] == 5
+        default = {
+            'a': {
+                'b': 1,
+                'c': 2
+            },
+            'd': 3
+        }
+        
+        override = {
+            'a': {
+                'b': 10
+            },
+            'e': 5
+        }
+        
+        result = loaded_cm._deep_merge(default, override)
+        
+        assert result['a']['b'] == 10
+        assert result['a']['c'] == 2
+        assert result['d'] == 3
+        assert result['e'] == 5
 
 
 if __name__ == "__main__":
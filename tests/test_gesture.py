@@ -3,19 +3,15 @@
 """
 
 import pytest
-import sys
-from pathlib import Path
 
-# 添加src到路径
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
-from domain.gesture import (
+from src.domain.gesture import (
     GestureType, GestureState, GestureEvent, 
     HandLandmarks, GestureStateMachine
 )
-from domain.effect import HeartCurve, Particle, ParticlePool
+from src.domain.effect import HeartCurve, Particle, ParticlePool, update_soa
+from src.domain.effect_kernels import to_pixels
 import math
-import time
+import numpy as np
 
 
 class TestGestureType:
@@ -81,6 +77,63 @@ class TestHandLandmarks:
         assert len(tips) == 5
         assert tips[0] == (0.04, 0.04, 0)  # 拇指尖
         assert tips[1] == (0.08, 0.08, 0)  # 食指尖
+    
+    def test_distance_sq(self):
+        """测试关键点距离平方"""
+        test_landmarks = [(0.5, 0.5, 0) for _ in range(21)]
+        test_landmarks[4] = (0.2, 0.3, 0.9)  # 拇指尖（z 不参与计算）
+        test_landmarks[8] = (0.5, 0.7, 0)    # 食指尖
+        
+        landmarks = HandLandmarks(landmarks=test_landmarks)
+        
+        assert abs(landmarks.distance_sq(4, 8) - 0.25) < 1e-9
+        assert landmarks.distance_sq(4, 21) == float('inf')
+    
+    def test_fingers_extended(self):
+        """测试五指伸展掩码"""
+        test_landmarks = [(0.5, 0.5, 0) for _ in range(21)]
+        test_landmarks[8] = (0.5, 0.2, 0)   # 食指尖高于PIP
+        test_landmarks[4] = (0.3, 0.5, 0)   # 右手拇指尖在IP左侧
+        
+        landmarks = HandLandmarks(landmarks=test_landmarks, handedness="Right")
+        mask = landmarks.fingers_extended
+        
+        assert mask.tolist() == [True, True, False, False, False]
+        assert landmarks.is_finger_extended(1)
+        assert not landmarks.is_finger_extended(2)
+        assert not landmarks.is_finger_extended(5)
+        assert landmarks.finger_mask == 0b11000
+    
+    def test_float32_landmarks(self):
+        """测试 float32 关键点数组保持原精度"""
+        arr = np.full((21, 3), 0.5, dtype=np.float32)
+        arr[12, 1] = 0.2  # 中指尖高于PIP
+        
+        landmarks = HandLandmarks(landmarks=arr)
+        
+        assert landmarks.landmarks.dtype == np.float32
+        assert landmarks.fingers_extended.tolist()[1:] == [False, True, False, False]
+        assert isinstance(landmarks.get_palm_center()[0], float)
+    
+    def test_pixel_xy(self):
+        """测试按采集分辨率换算的 int16 像素坐标"""
+        arr = np.full((21, 3), 0.5, dtype=np.float32)
+        arr[8] = (0.25, 0.75, 0)
+        
+        landmarks = HandLandmarks(landmarks=arr, image_size=(640, 480))
+        
+        assert landmarks.pixel_xy.dtype == np.int16
+        assert landmarks.pixel_xy.shape == (21, 2)
+        assert landmarks.pixel_xy[8].tolist() == [160, 360]
+        assert HandLandmarks(landmarks=arr).pixel_xy is None
+    
+    def test_to_pixels(self):
+        """测试关键点归一化坐标转像素坐标"""
+        points = np.array([[0.5, 0.25, 0.0], [0.999, 0.0, 1.0]], dtype=np.float32)
+        pixels = to_pixels(points, 640, 480)
+        
+        assert pixels.dtype == np.int32
+        assert pixels.tolist() == [[320, 120], [639, 0]]
 
 
 class TestGestureStateMachine:
@@ -102,13 +155,14 @@ class TestGestureStateMachine:
     
     def test_gesture_holding(self):
         """测试手势保持"""
-        sm = GestureStateMachine(hold_time_ms=50, cooldown_ms=100)
+        now = [0.0]
+        sm = GestureStateMachine(hold_time_ms=50, cooldown_ms=100, clock=lambda: now[0])
         
         # 检测
         sm.update(GestureType.FIST)
         
-        # 等待保持时间
-        time.sleep(0.1)
+        # 虚拟时钟前进，超过保持时间
+        now[0] = 0.1
         
         # 再次更新
         state, trigger = sm.update(GestureType.FIST)
@@ -169,6 +223,33 @@ class TestHeartCurve:
         points = HeartCurve.get_points(10, scale=1.0, center=(0, 0))
         assert len(points) == 10
     
+    def test_get_points_array(self):
+        """测试批量获取点与逐点计算一致"""
+        points = HeartCurve.get_points_array(8, scale=2.0, center=(1, 2))
+        assert points.shape == (8, 2)
+        assert points.dtype == np.float32
+        
+        for i in range(8):
+            expected = HeartCurve.get_point(2 * math.pi * i / 8, scale=2.0, center=(1, 2))
+            assert points[i, 0] == pytest.approx(expected[0], abs=1e-5)
+            assert points[i, 1] == pytest.approx(expected[1], abs=1e-5)
+    
+    def test_batch(self):
+        """测试向量化批量计算与 get_point 一致"""
+        t = np.linspace(0, 2 * math.pi, 16)
+        xs, ys = HeartCurve.batch(t, scale=50, center=(100, 100))
+        
+        for ti, x, y in zip(t, xs, ys):
+            expected = HeartCurve.get_point(ti, scale=50, center=(100, 100))
+            assert x == pytest.approx(expected[0])
+            assert y == pytest.approx(expected[1])
+    
+    def test_get_random_points_on_heart(self):
+        """测试批量随机点位于心形包围盒内"""
+        points = HeartCurve.get_random_points_on_heart(50, scale=1.0, center=(0, 0))
+        assert points.shape == (50, 2)
+        assert np.all(np.abs(points) <= 1.5)
+    
     def test_heart_shape(self):
         """测试心形形状正确性"""
         # 心形顶部应该有一个凹陷
@@ -201,6 +282,14 @@ class TestParticle:
         assert p.age == 0.1
         assert p.is_alive
     
+    def test_packed_color(self):
+        """测试颜色打包存储"""
+        p = Particle(x=0, y=0)
+        p.color = (255, 105, 180)
+        
+        assert p.color_u32 == 0xFF69B4
+        assert p.color == (255, 105, 180)
+    
     def test_particle_death(self):
         """测试粒子死亡"""
         p = Particle(x=0.5, y=0.5, lifetime=0.1)
@@ -208,6 +297,28 @@ class TestParticle:
         p.update(0.2)  # 超过生命周期
         
         assert not p.is_alive
+    
+    def test_update_soa_matches_particle(self):
+        """测试结构数组更新内核与 Particle.update 一致"""
+        particles = [
+            Particle(x=0.5, y=0.5, vx=0.1, vy=-0.1, ay=0.01, lifetime=1.0, twinkle=True, twinkle_speed=3),
+            Particle(x=0.2, y=0.3, vx=0.0, vy=0.2, lifetime=0.1),
+        ]
+        f32 = lambda attr: np.array([getattr(p, attr) for p in particles], dtype=np.float32)
+        arrays = [f32(a) for a in ('x', 'y', 'vx', 'vy', 'ax', 'ay', 'rotation', 'rotation_speed',
+                                   'age', 'lifetime', 'alpha')]
+        twinkle = np.array([p.twinkle for p in particles], dtype=np.uint8)
+        alive = np.ones(len(particles), dtype=np.uint8)
+        
+        for p in particles:
+            p.update(0.2)
+        update_soa(*arrays, twinkle, f32('twinkle_speed'), alive, 0.2)
+        
+        x, y, alpha = arrays[0], arrays[1], arrays[10]
+        assert alive.tolist() == [1, 0]
+        assert x[0] == pytest.approx(particles[0].x, abs=1e-5)
+        assert y[0] == pytest.approx(particles[0].y, abs=1e-5)
+        assert alpha[0] == pytest.approx(particles[0].alpha, abs=1e-5)
 
 
 class TestParticlePool:
@@ -258,6 +369,54 @@ class TestParticlePool:
         pool.clear_active()
         
         assert pool.active_count == 0
+    
+    def test_pool_grows(self):
+        """测试池耗尽后自动扩容"""
+        pool = ParticlePool(initial_size=2)
+        
+        particles = [pool.acquire(0.1 * i, 0.5) for i in range(5)]
+        
+        assert pool.active_count == 5
+        assert len({p.slot for p in particles}) == 5
+        assert particles[3].x == pytest.approx(0.3)
+    
+    def test_acquire_batch(self):
+        """测试批量获取槽位"""
+        pool = ParticlePool(initial_size=4)
+        
+        slots = pool.acquire_batch(10, 0.5, 0.25)
+        
+        assert len(set(slots.tolist())) == 10
+        assert pool.active_count == 10
+        assert np.allclose(pool.soa.y[slots], 0.25)
+    
+    def test_update_all_moves_particles(self):
+        """测试批量更新推进位置"""
+        pool = ParticlePool(initial_size=4)
+        
+        p = pool.acquire(0.5, 0.5)
+        p.vx = 1.0
+        p.lifetime = 1.0
+        pool.update_all(0.1)
+        
+        assert p.is_alive
+        assert p.x == pytest.approx(0.6)
+        assert p.alpha == pytest.approx(0.9)
+    
+    def test_snapshot_soa(self):
+        """测试导出结构数组"""
+        pool = ParticlePool(initial_size=10)
+        
+        p = pool.acquire(0.25, 0.75)
+        p.color = (10, 20, 30)
+        pool.acquire(0.5, 0.5)
+        
+        soa = pool.snapshot_soa()
+        
+        assert len(soa['x']) == 2
+        assert soa['x'][0] == pytest.approx(0.25)
+        assert soa['y'][0] == pytest.approx(0.75)
+        assert (soa['color_r'][0], soa['color_g'][0], soa['color_b'][0]) == (10, 20, 30)
 
 
 if __name__ == "__main__":